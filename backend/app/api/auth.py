@@ -3,13 +3,16 @@ from datetime import timedelta
 
 from fastapi import APIRouter, Query, Request, Depends, HTTPException, status
 from fastapi.responses import RedirectResponse
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.security import create_access_token
+from app.core.security import create_access_token, oauth2_scheme
+from app.core.token_cache import token_cache
 from app.db.database import get_db
 from app.models.user import User
 from app.services.github_service import github_service
+from app.services.portfolio_cache import bump_content_version
 
 router = APIRouter()
 
@@ -34,7 +37,7 @@ async def github_callback(
     request: Request,
     code: str = Query(...),
     state: str = Query(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
 
     """
@@ -69,21 +72,24 @@ async def github_callback(
     github_username = user_profile["login"]
 
     # Look for existing user by github_id
-    user = db.query(User).filter(User.github_id == github_id).first()
+    user = await db.scalar(select(User).filter(User.github_id == github_id))
 
     if user:
         # Update existing user
-        user.github_access_token = github_access_token
+        user.access_token = github_access_token
         user.avatar_url = user_profile.get("avatar_url")
         user.profile_url = user_profile.get("html_url")
         user.bio = user_profile.get("bio")
         user.location = user_profile.get("location")
         user.email = user_profile.get("email")
+        await bump_content_version(db, user.id)
+        # The cached principal records whether there is a GitHub token
+        token_cache.invalidate_user(user.id)
     else:
         # Create new user
         portfolio_username = github_username
         counter = 1
-        while db.query(User).filter(User.portfolio_username == portfolio_username).first():
+        while await db.scalar(select(User).filter(User.portfolio_username == portfolio_username)):
             portfolio_username = f"{github_username}{counter}"
             counter += 1
 
@@ -91,7 +97,7 @@ async def github_callback(
             github_id=github_id,
             github_username=github_username,
             portfolio_username=portfolio_username,
-            github_access_token=github_access_token,
+            access_token=github_access_token,
             avatar_url=user_profile.get("avatar_url"),
             profile_url=user_profile.get("html_url"),
             bio=user_profile.get("bio"),
@@ -100,8 +106,8 @@ async def github_callback(
         )
         db.add(user)
 
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
 
     # Generate JWT for your application
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -123,6 +129,11 @@ async def github_callback(
 
 
 @router.post("/logout")
-async def logout():
-    """Client-side logout endpoint (just informational)"""
+async def logout(token: str = Depends(oauth2_scheme)):
+    """
+    Client-side logout endpoint. Drops the token from the auth cache; the
+    JWT itself stays valid until it expires.
+    """
+    if token:
+        token_cache.invalidate(token)
     return {"message": "Logged out successfully. Please clear localStorage on client."}
\ No newline at end of file
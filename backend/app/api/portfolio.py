@@ -1,132 +1,86 @@
-from fastapi import APIRouter, HTTPException, status, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, status, Depends, Request
+from fastapi.responses import Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from app.db.database import get_db
+from app.core.http_cache import make_etag, etag_matches, public_cache_headers
+from app.core.responses import FastJSONResponse, dumps_json
 from app.models.user import User
 from app.models.project import Project
-from app.models.experience import Experience
-from app.models.education import Education
-from app.models.skill import Skill
 from app.models.media import Media
 from app.schemas.portfolio import PortfolioResponse
+from app.services.portfolio_cache import portfolio_cache
 
 router = APIRouter()
 
 
-@router.get("/{portfolio_username}", response_model=dict)
+@router.get(
+    "/{portfolio_username}",
+    response_model=PortfolioResponse,
+    response_class=FastJSONResponse,
+)
 async def get_public_portfolio(
     portfolio_username: str,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_db),
 ):
     """Get public portfolio by username (no authentication required)"""
-    user = db.query(User).filter(
+    # Only the user row is needed to answer revalidations and cache hits
+    owner = (await db.execute(select(User.id, User.content_version).filter(
         User.portfolio_username == portfolio_username,
         User.is_public == True
-    ).first()
+    ))).first()
     
-    if not user:
+    if not owner:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Portfolio not found",
         )
     
-    # Get visible projects only
-    projects = db.query(Project).filter(
-        Project.user_id == user.id,
-        Project.is_visible == True
-    ).all()
-    
-    # Get experiences
-    experiences = db.query(Experience).filter(
-        Experience.user_id == user.id
-    ).all()
+    etag = make_etag("portfolio", owner.id, owner.content_version)
+    headers = public_cache_headers(etag)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
     
-    # Get education
-    education = db.query(Education).filter(
-        Education.user_id == user.id
-    ).all()
+    body = await portfolio_cache.get(db, portfolio_username, owner.content_version)
+    if body is None:
+        portfolio = await build_public_portfolio(portfolio_username, db)
+        body = dumps_json(portfolio.model_dump())
+        await portfolio_cache.put(db, portfolio_username, owner.content_version, body)
     
-    # Get skills
-    skills = db.query(Skill).filter(
-        Skill.user_id == user.id
-    ).all()
+    return Response(content=body, media_type=FastJSONResponse.media_type, headers=headers)
+
+
+async def build_public_portfolio(portfolio_username: str, db: AsyncSession) -> PortfolioResponse:
+    """Assemble the public portfolio payload from the database"""
+    # Load the user and every child collection up front: one query for the
+    # user plus one per collection, however many projects there are
+    user = await db.scalar(select(User).options(
+        selectinload(
+            User.projects.and_(Project.is_visible == True)
+        ).selectinload(Project.media),
+        selectinload(User.experiences),
+        selectinload(User.education),
+        selectinload(User.skills),
+        # Portfolio-level media only
+        selectinload(User.media.and_(Media.project_id == None)),
+    ).filter(
+        User.portfolio_username == portfolio_username,
+        User.is_public == True
+    ))
     
-    # Get media
-    media = db.query(Media).filter(
-        Media.user_id == user.id,
-        Media.project_id == None  # Portfolio-level media
-    ).all()
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Portfolio not found",
+        )
     
-    return {
-        "user": {
-            "portfolio_username": user.portfolio_username,
-            "github_username": user.github_username,
-            "bio": user.bio,
-            "location": user.location,
-            "avatar_url": user.avatar_url,
-            "profile_url": user.profile_url,
-            "created_at": user.created_at.isoformat() if user.created_at else None,
-        },
-        "projects": [
-            {
-                "id": p.id,
-                "name": p.name,
-                "description": p.description,
-                "url": p.url,
-                "deployed_url": p.deployed_url,
-                "status": p.status,
-                "languages": p.languages,
-                "stars": p.stars,
-                "forks": p.forks,
-                "media": db.query(Media).filter(Media.project_id == p.id).all()
-            }
-            for p in projects
-        ],
-        "experiences": [
-            {
-                "id": e.id,
-                "title": e.title,
-                "company": e.company,
-                "location": e.location,
-                "description": e.description,
-                "start_date": e.start_date.isoformat() if e.start_date else None,
-                "end_date": e.end_date.isoformat() if e.end_date else None,
-                "is_current": bool(e.is_current),
-            }
-            for e in experiences
-        ],
-        "education": [
-            {
-                "id": ed.id,
-                "school": ed.school,
-                "degree": ed.degree,
-                "field_of_study": ed.field_of_study,
-                "description": ed.description,
-                "start_date": ed.start_date.isoformat() if ed.start_date else None,
-                "end_date": ed.end_date.isoformat() if ed.end_date else None,
-                "is_current": bool(ed.is_current),
-            }
-            for ed in education
-        ],
-        "skills": [
-            {
-                "id": s.id,
-                "name": s.name,
-                "proficiency": s.proficiency,
-                "category": s.category,
-            }
-            for s in skills
-        ],
-        "media": [
-            {
-                "id": m.id,
-                "filename": m.filename,
-                "file_path": m.file_path,
-                "media_type": m.media_type,
-                "mime_type": m.mime_type,
-                "title": m.title,
-                "description": m.description,
-                "order": m.order,
-            }
-            for m in media
-        ],
-    }
+    return PortfolioResponse.model_validate({
+        "user": user,
+        "projects": user.projects,
+        "experiences": user.experiences,
+        "education": user.education,
+        "skills": user.skills,
+        "media": user.media,
+    })
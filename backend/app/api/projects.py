@@ -1,173 +1,171 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Literal
 
 from app.db.database import get_db
-from app.core.security import get_current_user
-from app.models.user import User
+from app.core.security import get_current_principal
+from app.core.token_cache import Principal
+from app.core.pagination import encode_cursor, decode_cursor, keyset_after
 from app.models.project import Project
+from app.models.sync_job import SyncJob
 from app.schemas.project import (
     ProjectResponse, ProjectUpdate, ProjectPublicResponse, 
-    ProjectSyncRequest, ProjectListResponse
+    ProjectSyncRequest, ProjectListResponse, SyncJobResponse,
+    ProjectReadmeResponse,
 )
-from app.services.github_service import github_service
+from app.services.sync_jobs import sync_job_queue
+from app.services.portfolio_cache import bump_content_version
 
 router = APIRouter()
 
+# Sort options for the project list: column and whether it sorts descending.
+# Ties are broken by id in the same direction.
+PROJECT_SORTS = {
+    "updated": (Project.updated_at, True),
+    "stars": (Project.stars, True),
+    "name": (Project.name, False),
+}
+# Type of each sort's key in a cursor: datetime, int and str
+PROJECT_CURSOR_KEYS = {
+    sort: column.type.python_type for sort, (column, _) in PROJECT_SORTS.items()
+}
 
-async def sync_user_projects(user: User, db: Session):
-    """Sync projects from GitHub for a user"""
-    if not user.access_token:
+
+@router.post("/sync", response_model=SyncJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def sync_projects(
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+    full: bool = Query(False, description="Resync repos even if unchanged on GitHub"),
+):
+    """Queue a background sync of projects from GitHub"""
+    if not current_user.has_github_token:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No GitHub access token available",
         )
     
-    # Fetch repositories from GitHub
-    repos = await github_service.get_user_repos(
-        user.access_token, 
-        user.github_username
-    )
-    
-    synced_projects = []
-    
-    for repo in repos:
-        # Check if project already exists
-        existing_project = db.query(Project).filter(
-            Project.github_id == repo["id"],
-            Project.user_id == user.id
-        ).first()
-        
-        # Fetch languages
-        languages = await github_service.get_repo_languages(
-            user.access_token,
-            repo["owner"]["login"],
-            repo["name"]
-        )
-        
-        # Fetch README
-        readme = await github_service.get_readme_content(
-            user.access_token,
-            repo["owner"]["login"],
-            repo["name"]
-        )
-        
-        # Detect demo URL
-        deployed_url = github_service.detect_demo_url(
-            repo.get("homepage"),
-            readme
-        )
-        
-        # Classify project
-        status_type = github_service.classify_project(
-            deployed_url,
-            bool(repo.get("homepage")),
-            repo.get("description")
-        )
-        
-        if existing_project:
-            # Update existing project
-            existing_project.name = repo["name"]
-            existing_project.description = repo.get("description")
-            existing_project.url = repo["html_url"]
-            existing_project.homepage = repo.get("homepage")
-            existing_project.readme_content = readme
-            existing_project.languages = languages
-            existing_project.stars = repo.get("stargazers_count", 0)
-            existing_project.forks = repo.get("forks_count", 0)
-            existing_project.watchers = repo.get("watchers_count", 0)
-            existing_project.is_deployed = deployed_url is not None
-            existing_project.deployed_url = deployed_url
-            existing_project.status = status_type
-            existing_project.is_archived = repo.get("archived", False)
-            existing_project.is_fork = repo.get("fork", False)
-            existing_project.github_updated_at = datetime.utcnow()
-            existing_project.updated_at = datetime.utcnow()
-            db.commit()
-            synced_projects.append(existing_project)
-        else:
-            # Create new project
-            new_project = Project(
-                user_id=user.id,
-                github_id=repo["id"],
-                name=repo["name"],
-                description=repo.get("description"),
-                url=repo["html_url"],
-                homepage=repo.get("homepage"),
-                readme_content=readme,
-                languages=languages,
-                stars=repo.get("stargazers_count", 0),
-                forks=repo.get("forks_count", 0),
-                watchers=repo.get("watchers_count", 0),
-                is_deployed=deployed_url is not None,
-                deployed_url=deployed_url,
-                status=status_type,
-                is_archived=repo.get("archived", False),
-                is_fork=repo.get("fork", False),
-                github_updated_at=datetime.utcnow(),
-            )
-            db.add(new_project)
-            db.commit()
-            db.refresh(new_project)
-            synced_projects.append(new_project)
-    
-    # Update last sync time
-    user.last_sync = datetime.utcnow()
-    db.commit()
-    
-    return synced_projects
+    return await sync_job_queue.enqueue(db, current_user.id, full=full)
 
 
-@router.post("/sync")
-async def sync_projects(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+@router.get("/sync/{job_id}", response_model=SyncJobResponse)
+async def get_sync_job(
+    job_id: int,
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
 ):
-    """Manually sync projects from GitHub"""
-    synced = await sync_user_projects(current_user, db)
-    return {
-        "message": f"Synced {len(synced)} projects",
-        "synced_count": len(synced)
-    }
+    """Get progress of a sync job"""
+    job = await db.scalar(select(SyncJob).filter(
+        SyncJob.id == job_id,
+        SyncJob.user_id == current_user.id
+    ))
+    
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Sync job not found",
+        )
+    
+    return job
 
 
 @router.get("", response_model=ProjectListResponse)
 async def get_user_projects(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-    skip: int = Query(0, ge=0),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+    skip: int = Query(0, ge=0, description="Offset paging; prefer cursor"),
     limit: int = Query(20, ge=1, le=100),
     status_filter: Optional[str] = Query(None),
+    sort: Literal["updated", "stars", "name"] = Query("updated"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    include_total: bool = Query(True, description="Also count all matching projects"),
 ):
-    """Get user's projects"""
-    query = db.query(Project).filter(Project.user_id == current_user.id)
+    """Get user's projects, one page at a time"""
+    column, descending = PROJECT_SORTS[sort]
+    
+    query = select(Project).filter(Project.user_id == current_user.id)
     
     if status_filter:
         query = query.filter(Project.status == status_filter)
     
-    total = query.count()
-    projects = query.offset(skip).limit(limit).all()
+    total = None
+    if include_total:
+        total = await db.scalar(
+            select(func.count()).select_from(query.subquery())
+        )
+    
+    if cursor:
+        try:
+            cursor_sort, key, last_id = decode_cursor(cursor, PROJECT_CURSOR_KEYS)
+        except ValueError:
+            cursor_sort = None
+        if cursor_sort != sort:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            )
+        query = query.filter(keyset_after(column, Project.id, key, last_id, descending))
+    elif skip:
+        query = query.offset(skip)
+    
+    if descending:
+        query = query.order_by(column.desc(), Project.id.desc())
+    else:
+        query = query.order_by(column.asc(), Project.id.asc())
+    
+    # One extra row tells us whether there is a next page
+    projects = (await db.scalars(query.limit(limit + 1))).all()
+    next_cursor = None
+    if len(projects) > limit:
+        projects = projects[:limit]
+        last = projects[-1]
+        next_cursor = encode_cursor(sort, getattr(last, column.key), last.id)
     
     return {
         "items": projects,
         "total": total,
         "page": skip // limit,
         "page_size": limit,
+        "next_cursor": next_cursor,
     }
 
 
 @router.get("/{project_id}", response_model=ProjectResponse)
 async def get_project(
     project_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
 ):
     """Get a specific project"""
-    project = db.query(Project).filter(
+    project = await db.scalar(select(Project).filter(
+        Project.id == project_id,
+        Project.user_id == current_user.id
+    ))
+    
+    if not project:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found",
+        )
+    
+    return project
+
+
+@router.get("/{project_id}/readme", response_model=ProjectReadmeResponse)
+async def get_project_readme(
+    project_id: int,
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+):
+    """Get a project's README"""
+    project = await db.scalar(select(Project).options(
+        undefer(Project.readme_content)
+    ).filter(
         Project.id == project_id,
         Project.user_id == current_user.id
-    ).first()
+    ))
     
     if not project:
         raise HTTPException(
@@ -182,14 +180,14 @@ async def get_project(
 async def update_project(
     project_id: int,
     project_update: ProjectUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
 ):
     """Update project (e.g., visibility)"""
-    project = db.query(Project).filter(
+    project = await db.scalar(select(Project).filter(
         Project.id == project_id,
         Project.user_id == current_user.id
-    ).first()
+    ))
     
     if not project:
         raise HTTPException(
@@ -201,22 +199,23 @@ async def update_project(
         project.is_visible = project_update.is_visible
     
     project.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(project)
+    await bump_content_version(db, current_user.id)
+    await db.commit()
+    await db.refresh(project)
     return project
 
 
 @router.delete("/{project_id}")
 async def delete_project(
     project_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
 ):
     """Delete project"""
-    project = db.query(Project).filter(
+    project = await db.scalar(select(Project).filter(
         Project.id == project_id,
         Project.user_id == current_user.id
-    ).first()
+    ))
     
     if not project:
         raise HTTPException(
@@ -224,6 +223,7 @@ async def delete_project(
             detail="Project not found",
         )
     
-    db.delete(project)
-    db.commit()
+    await db.delete(project)
+    await bump_content_version(db, current_user.id)
+    await db.commit()
     return {"message": "Project deleted"}
\ No newline at end of file
@@ -1,38 +1,106 @@
 from fastapi import APIRouter, File, UploadFile, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.database import get_db
-from app.core.security import get_current_user
+from app.core.config import settings
+from app.core.security import get_current_user, get_current_principal
+from app.core.token_cache import Principal
 from app.models.user import User
-from app.services.resume_parser import resume_parser
+from app.services.resume_parser import sniff_resume_type
+from app.services.resume_pool import resume_pool, ResumePoolBusy, ResumeProcessingError
+from app.services.resume_cache import resume_cache
 from app.schemas.resume import ResumeUploadResponse, ResumeParseResponse
-import io
+import hashlib
+import os
+import tempfile
+from typing import Tuple
 
 router = APIRouter()
 
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+def _too_large() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+        detail=f"File exceeds the {settings.MAX_UPLOAD_SIZE // (1024 * 1024)}MB limit",
+    )
+
+
+def _spool_upload(file: UploadFile) -> Tuple[str, str]:
+    """
+    Copy an upload to a temp file in chunks, stopping as soon as it goes
+    over MAX_UPLOAD_SIZE. Returns the path and the content's SHA-256; the
+    caller deletes the file. Blocking; run in a thread.
+    """
+    spool = tempfile.NamedTemporaryFile(prefix="resume-", delete=False)
+    digest = hashlib.sha256()
+    try:
+        with spool:
+            size = 0
+            while chunk := file.file.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > settings.MAX_UPLOAD_SIZE:
+                    raise _too_large()
+                spool.write(chunk)
+                digest.update(chunk)
+    except BaseException:
+        os.unlink(spool.name)
+        raise
+    return spool.name, digest.hexdigest()
+
 
 @router.post("/upload", response_model=ResumeUploadResponse)
 async def upload_resume(
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Upload and parse resume"""
-    # Validate file type
-    allowed_types = ["application/pdf", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"]
-    if file.content_type not in allowed_types:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Only PDF and DOCX files are supported",
-        )
+    if file.size is not None and file.size > settings.MAX_UPLOAD_SIZE:
+        raise _too_large()
     
-    # Read file content
-    content = await file.read()
+    # End the transaction that loaded the user: no connection is held
+    # while the upload is copied and parsed
+    await db.commit()
     
-    # Extract text based on file type
-    if file.content_type == "application/pdf":
-        text = await resume_parser.extract_text_from_pdf(content)
-    else:  # DOCX
-        text = resume_parser.extract_text_from_docx(content)
+    path, content_digest = await run_in_threadpool(_spool_upload, file)
+    try:
+        # Same file seen before: reuse its results
+        cache_key = resume_cache.make_key(content_digest)
+        cached = await resume_cache.get(db, cache_key)
+        if cached is not None:
+            text, parsed_data = cached
+        else:
+            # Validate file type from its content; the declared content_type
+            # is whatever the client says
+            content_type = await run_in_threadpool(sniff_resume_type, path)
+            if content_type is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Only PDF and DOCX files are supported",
+                )
+            
+            # Extract and parse text in a worker process, after ending the
+            # cache lookup's transaction
+            await db.commit()
+            text, parsed_data = await resume_pool.submit(path, content_type)
+            if text:
+                await resume_cache.store(db, cache_key, text, parsed_data)
+    except ResumePoolBusy:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many resumes are being processed, try again shortly",
+            headers={"Retry-After": "5"},
+        )
+    except ResumeProcessingError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail=str(e),
+        )
+    finally:
+        os.unlink(path)
     
     if not text:
         raise HTTPException(
@@ -40,13 +108,10 @@ async def upload_resume(
             detail="Failed to extract text from resume",
         )
     
-    # Parse resume
-    parsed_data = resume_parser.parse_resume_text(text)
-    
     # Save raw resume text
     current_user.resume_raw = text
     current_user.resume_text = text[:5000]  # Summary
-    db.commit()
+    await db.commit()
     
     return {
         "message": f"Resume {file.filename} uploaded and parsed",
@@ -61,13 +126,18 @@ async def upload_resume(
 
 @router.get("/text")
 async def get_resume_text(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
 ):
     """Get stored resume text"""
-    if not current_user.resume_raw:
+    # Deferred column; not loaded with current_user
+    resume_raw = await db.scalar(
+        select(User.resume_raw).filter(User.id == current_user.id)
+    )
+    if not resume_raw:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No resume uploaded",
         )
     
-    return {"resume_text": current_user.resume_raw}
+    return {"resume_text": resume_raw}
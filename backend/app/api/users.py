@@ -1,14 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 
 from app.db.database import get_db
-from app.core.security import get_current_user
+from app.core.security import get_current_user, get_current_principal
+from app.core.token_cache import Principal, token_cache
+from app.core.http_cache import make_etag, etag_matches, public_cache_headers
 from app.models.user import User
 from app.models.experience import Experience
 from app.models.education import Education
 from app.models.skill import Skill
 from app.schemas.user import UserResponse, UserUpdate, UserPublicResponse
+from app.services.portfolio_cache import bump_content_version
 from app.schemas.resume import (
     ExperienceResponse, ExperienceCreate, ExperienceUpdate,
     EducationResponse, EducationCreate, EducationUpdate,
@@ -30,7 +34,7 @@ async def get_current_user_profile(
 async def update_user_profile(
     user_update: UserUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Update current user's profile"""
     if user_update.bio is not None:
@@ -41,21 +45,26 @@ async def update_user_profile(
         current_user.is_public = user_update.is_public
     
     current_user.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(current_user)
+    await bump_content_version(db, current_user.id)
+    await db.commit()
+    await db.refresh(current_user)
+    # is_public is part of the cached principal
+    token_cache.invalidate_user(current_user.id)
     return current_user
 
 
 @router.get("/{portfolio_username}", response_model=UserPublicResponse)
 async def get_public_user_profile(
     portfolio_username: str,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
 ):
     """Get public user profile by portfolio username"""
-    user = db.query(User).filter(
+    user = await db.scalar(select(User).filter(
         User.portfolio_username == portfolio_username,
         User.is_public == True
-    ).first()
+    ))
     
     if not user:
         raise HTTPException(
@@ -63,6 +72,12 @@ async def get_public_user_profile(
             detail="User not found",
         )
     
+    etag = make_etag("profile", user.id, user.content_version)
+    headers = public_cache_headers(etag)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    response.headers.update(headers)
     return user
 
 
@@ -70,8 +85,8 @@ async def get_public_user_profile(
 @router.post("/me/experience", response_model=ExperienceResponse)
 async def create_experience(
     experience: ExperienceCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
 ):
     """Add work experience"""
     db_experience = Experience(
@@ -79,34 +94,35 @@ async def create_experience(
         **experience.dict()
     )
     db.add(db_experience)
-    db.commit()
-    db.refresh(db_experience)
+    await bump_content_version(db, current_user.id)
+    await db.commit()
+    await db.refresh(db_experience)
     return db_experience
 
 
 @router.get("/me/experience", response_model=list[ExperienceResponse])
 async def get_user_experiences(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
 ):
     """Get all work experiences"""
-    return db.query(Experience).filter(
+    return (await db.scalars(select(Experience).filter(
         Experience.user_id == current_user.id
-    ).all()
+    ))).all()
 
 
 @router.put("/me/experience/{experience_id}", response_model=ExperienceResponse)
 async def update_experience(
     experience_id: int,
     experience_update: ExperienceUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
 ):
     """Update work experience"""
-    db_experience = db.query(Experience).filter(
+    db_experience = await db.scalar(select(Experience).filter(
         Experience.id == experience_id,
         Experience.user_id == current_user.id
-    ).first()
+    ))
     
     if not db_experience:
         raise HTTPException(
@@ -117,22 +133,23 @@ async def update_experience(
     for key, value in experience_update.dict(exclude_unset=True).items():
         setattr(db_experience, key, value)
     
-    db.commit()
-    db.refresh(db_experience)
+    await bump_content_version(db, current_user.id)
+    await db.commit()
+    await db.refresh(db_experience)
     return db_experience
 
 
 @router.delete("/me/experience/{experience_id}")
 async def delete_experience(
     experience_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
 ):
     """Delete work experience"""
-    db_experience = db.query(Experience).filter(
+    db_experience = await db.scalar(select(Experience).filter(
         Experience.id == experience_id,
         Experience.user_id == current_user.id
-    ).first()
+    ))
     
     if not db_experience:
         raise HTTPException(
@@ -140,8 +157,9 @@ async def delete_experience(
             detail="Experience not found",
         )
     
-    db.delete(db_experience)
-    db.commit()
+    await db.delete(db_experience)
+    await bump_content_version(db, current_user.id)
+    await db.commit()
     return {"message": "Experience deleted"}
 
 
@@ -149,8 +167,8 @@ async def delete_experience(
 @router.post("/me/education", response_model=EducationResponse)
 async def create_education(
     education: EducationCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
 ):
     """Add education"""
     db_education = Education(
@@ -158,34 +176,35 @@ async def create_education(
         **education.dict()
     )
     db.add(db_education)
-    db.commit()
-    db.refresh(db_education)
+    await bump_content_version(db, current_user.id)
+    await db.commit()
+    await db.refresh(db_education)
     return db_education
 
 
 @router.get("/me/education", response_model=list[EducationResponse])
 async def get_user_education(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
 ):
     """Get all education"""
-    return db.query(Education).filter(
+    return (await db.scalars(select(Education).filter(
         Education.user_id == current_user.id
-    ).all()
+    ))).all()
 
 
 @router.put("/me/education/{education_id}", response_model=EducationResponse)
 async def update_education(
     education_id: int,
     education_update: EducationUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
 ):
     """Update education"""
-    db_education = db.query(Education).filter(
+    db_education = await db.scalar(select(Education).filter(
         Education.id == education_id,
         Education.user_id == current_user.id
-    ).first()
+    ))
     
     if not db_education:
         raise HTTPException(
@@ -196,22 +215,23 @@ async def update_education(
     for key, value in education_update.dict(exclude_unset=True).items():
         setattr(db_education, key, value)
     
-    db.commit()
-    db.refresh(db_education)
+    await bump_content_version(db, current_user.id)
+    await db.commit()
+    await db.refresh(db_education)
     return db_education
 
 
 @router.delete("/me/education/{education_id}")
 async def delete_education(
     education_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
 ):
     """Delete education"""
-    db_education = db.query(Education).filter(
+    db_education = await db.scalar(select(Education).filter(
         Education.id == education_id,
         Education.user_id == current_user.id
-    ).first()
+    ))
     
     if not db_education:
         raise HTTPException(
@@ -219,8 +239,9 @@ async def delete_education(
             detail="Education not found",
         )
     
-    db.delete(db_education)
-    db.commit()
+    await db.delete(db_education)
+    await bump_content_version(db, current_user.id)
+    await db.commit()
     return {"message": "Education deleted"}
 
 
@@ -228,8 +249,8 @@ async def delete_education(
 @router.post("/me/skills", response_model=SkillResponse)
 async def create_skill(
     skill: SkillCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
 ):
     """Add skill"""
     db_skill = Skill(
@@ -237,34 +258,35 @@ async def create_skill(
         **skill.dict()
     )
     db.add(db_skill)
-    db.commit()
-    db.refresh(db_skill)
+    await bump_content_version(db, current_user.id)
+    await db.commit()
+    await db.refresh(db_skill)
     return db_skill
 
 
 @router.get("/me/skills", response_model=list[SkillResponse])
 async def get_user_skills(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
 ):
     """Get all skills"""
-    return db.query(Skill).filter(
+    return (await db.scalars(select(Skill).filter(
         Skill.user_id == current_user.id
-    ).all()
+    ))).all()
 
 
 @router.put("/me/skills/{skill_id}", response_model=SkillResponse)
 async def update_skill(
     skill_id: int,
     skill_update: SkillUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
 ):
     """Update skill"""
-    db_skill = db.query(Skill).filter(
+    db_skill = await db.scalar(select(Skill).filter(
         Skill.id == skill_id,
         Skill.user_id == current_user.id
-    ).first()
+    ))
     
     if not db_skill:
         raise HTTPException(
@@ -275,22 +297,23 @@ async def update_skill(
     for key, value in skill_update.dict(exclude_unset=True).items():
         setattr(db_skill, key, value)
     
-    db.commit()
-    db.refresh(db_skill)
+    await bump_content_version(db, current_user.id)
+    await db.commit()
+    await db.refresh(db_skill)
     return db_skill
 
 
 @router.delete("/me/skills/{skill_id}")
 async def delete_skill(
     skill_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
 ):
     """Delete skill"""
-    db_skill = db.query(Skill).filter(
+    db_skill = await db.scalar(select(Skill).filter(
         Skill.id == skill_id,
         Skill.user_id == current_user.id
-    ).first()
+    ))
     
     if not db_skill:
         raise HTTPException(
@@ -298,6 +321,7 @@ async def delete_skill(
             detail="Skill not found",
         )
     
-    db.delete(db_skill)
-    db.commit()
+    await db.delete(db_skill)
+    await bump_content_version(db, current_user.id)
+    await db.commit()
     return {"message": "Skill deleted"}
\ No newline at end of file
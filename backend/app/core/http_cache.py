@@ -0,0 +1,28 @@
+from typing import Optional, Dict
+
+from app.core.config import settings
+
+
+def make_etag(kind: str, user_id: int, content_version: int) -> str:
+    """Strong ETag for a public representation of a user's content"""
+    return f'"{kind}-{user_id}-{content_version}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header covers the given ETag"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    # Weak comparison, as If-None-Match requires
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def public_cache_headers(etag: str) -> Dict[str, str]:
+    """Validator and Cache-Control headers for public, anonymous responses"""
+    return {
+        "ETag": etag,
+        "Cache-Control": (
+            f"public, max-age={settings.PUBLIC_CACHE_MAX_AGE}, "
+            f"stale-while-revalidate={settings.PUBLIC_CACHE_STALE_WHILE_REVALIDATE}"
+        ),
+    }
@@ -0,0 +1,56 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, Tuple
+
+from sqlalchemy import tuple_
+
+
+def encode_cursor(sort: str, key: Any, last_id: int) -> str:
+    """Opaque cursor pointing just past the row with this sort key and id"""
+    if isinstance(key, datetime):
+        key = {"dt": key.isoformat()}
+    payload = json.dumps([sort, key, last_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, key_types: Dict[str, type]) -> Tuple[str, Any, int]:
+    """
+    (sort, key, last_id) from a cursor. key_types maps each sort to the
+    type of its key; raises ValueError if the cursor is malformed, names
+    another sort or carries a key of the wrong type, since such a key
+    would either fail in the database or compare as something else.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort, key, last_id = json.loads(base64.urlsafe_b64decode(padded))
+        if isinstance(key, dict):
+            key = datetime.fromisoformat(key["dt"])
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError("Invalid cursor") from e
+    key_type = key_types.get(sort) if isinstance(sort, str) else None
+    if (
+        key_type is None
+        # bool is an int, but never a valid key or id
+        or not isinstance(key, key_type) or isinstance(key, bool)
+        or not isinstance(last_id, int) or isinstance(last_id, bool)
+    ):
+        raise ValueError("Invalid cursor")
+    return sort, key, last_id
+
+
+def keyset_after(column, id_column, key: Any, last_id: int, descending: bool):
+    """
+    Filter for the rows that come after (key, last_id) when ordering by
+    column then id_column in the given direction. With an index on
+    (..., column, id) the database seeks straight to the page instead of
+    scanning and discarding an OFFSET.
+
+    This is a row-value comparison rather than the equivalent
+    `column < key OR (column = key AND id < last_id)`: SQLite only uses
+    the index to bound the row form, and walks the OR form from the
+    first row of the index.
+    """
+    if descending:
+        return tuple_(column, id_column) < tuple_(key, last_id)
+    return tuple_(column, id_column) > tuple_(key, last_id)
@@ -4,8 +4,10 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import settings
+from app.core.token_cache import Principal, token_cache
 from app.models.user import User
 from app.db.database import get_db
 
@@ -53,10 +55,14 @@ def decode_access_token(token: str) -> Optional[dict]:
         return None
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
-) -> User:
-    """Get current authenticated user from JWT token"""
+async def get_current_principal(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)
+) -> Principal:
+    """
+    Get the authenticated user's id and flags from the JWT token.
+    Cached per token, so most requests neither decode the token nor hit
+    the database; use get_current_user when the full User row is needed.
+    """
     if not token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -64,6 +70,10 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    principal = token_cache.get(token)
+    if principal is not None:
+        return principal
+    
     payload = decode_access_token(token)
     if payload is None:
         raise HTTPException(
@@ -80,8 +90,38 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user = db.query(User).filter(User.id == user_id).first()
+    row = (await db.execute(select(
+        User.id,
+        User.github_username,
+        User.portfolio_username,
+        User.is_public,
+        User.access_token.is_not(None),
+    ).filter(User.id == int(user_id)))).first()
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+        )
+    
+    principal = Principal(
+        id=row[0],
+        github_username=row[1],
+        portfolio_username=row[2],
+        is_public=bool(row[3]),
+        has_github_token=bool(row[4]),
+    )
+    token_cache.put(token, principal, payload.get("exp"))
+    return principal
+
+
+async def get_current_user(
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    """Get current authenticated user's full row"""
+    user = await db.get(User, principal.id)
     if user is None:
+        token_cache.invalidate_user(principal.id)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
@@ -0,0 +1,95 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, Set, Tuple
+
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated user, as far as most endpoints need to know"""
+    id: int
+    github_username: str
+    portfolio_username: str
+    is_public: bool
+    has_github_token: bool
+
+
+class TokenCache:
+    """
+    In-process TTL + LRU cache of bearer token -> Principal.
+
+    A hit skips both JWT decoding and the user lookup. Entries live for at
+    most AUTH_CACHE_TTL seconds and never past the token's own expiry, so
+    changes made by another worker show up within the TTL; changes made
+    here invalidate immediately.
+    """
+
+    def __init__(self):
+        self.max_entries = settings.AUTH_CACHE_SIZE
+        self.ttl = settings.AUTH_CACHE_TTL
+        self._entries: "OrderedDict[str, Tuple[float, Principal]]" = OrderedDict()
+        self._tokens_by_user: Dict[int, Set[str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[Principal]:
+        """Cached principal for a token, or None on a miss"""
+        entry = self._entries.get(token)
+        if entry is not None:
+            expires_at, principal = entry
+            if time.monotonic() < expires_at:
+                self._entries.move_to_end(token)
+                self.hits += 1
+                return principal
+            self._drop(token)
+        self.misses += 1
+        return None
+
+    def put(self, token: str, principal: Principal, token_exp: Optional[float] = None):
+        """Cache a principal; token_exp is the token's 'exp' claim (epoch seconds)"""
+        ttl = self.ttl
+        if token_exp is not None:
+            ttl = min(ttl, token_exp - time.time())
+        if ttl <= 0:
+            return
+
+        self._drop(token)
+        self._entries[token] = (time.monotonic() + ttl, principal)
+        self._tokens_by_user.setdefault(principal.id, set()).add(token)
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+
+    def invalidate(self, token: str):
+        """Forget one token (e.g. on logout)"""
+        self._drop(token)
+
+    def invalidate_user(self, user_id: int):
+        """Forget every token of a user (e.g. after a profile change)"""
+        for token in list(self._tokens_by_user.get(user_id, ())):
+            self._drop(token)
+
+    def _drop(self, token: str):
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        tokens = self._tokens_by_user.get(entry[1].id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[entry[1].id]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+# Global instance
+token_cache = TokenCache()
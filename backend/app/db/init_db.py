@@ -1,6 +1,5 @@
-from sqlalchemy import text
-
 from app.db.database import engine, Base
+from app.db.migrations import run_migrations
 
 
 def init_db():
@@ -8,13 +7,12 @@ def init_db():
     Create all tables defined in models (when Base.metadata.create_all is called).
     Safe to call multiple times — only creates missing tables.
     """
-    # Optional: enable foreign key support (good practice with SQLite)
-    with engine.connect() as connection:
-        connection.execute(text("PRAGMA foreign_keys = ON;"))
-        connection.commit()
-
+    # Foreign keys (and the other SQLite pragmas) are enabled per
+    # connection in app.db.database
     # Create tables (will be no-op if they already exist)
     Base.metadata.create_all(bind=engine)
+    # Bring tables that already existed up to the current schema
+    run_migrations(engine)
 
 
 # Optional: function to drop everything (useful in development/testing)
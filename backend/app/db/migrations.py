@@ -0,0 +1,198 @@
+"""
+Versioned schema migrations.
+
+create_all only creates missing tables, so changes to existing tables
+(new columns, new indexes) are applied here. Every migration runs once per
+database and is recorded in the schema_migrations table. Steps are written
+to be no-ops when the schema is already up to date, which is the case for
+a database whose tables were just created from the current models.
+
+To change the schema: update the model, then append a migration to
+MIGRATIONS with the next version number.
+"""
+from datetime import datetime
+from typing import Callable, List, Tuple
+
+from sqlalchemy import (
+    Column, DateTime, Integer, MetaData, String, Table, bindparam, inspect,
+    select, text,
+)
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import CreateColumn
+
+from app.db.database import Base
+from app.db.types import decompress_text, is_compressed
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+
+migration_metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    migration_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def add_column(connection: Connection, table_name: str, column_name: str):
+    """Add a column declared on a model, if the table doesn't have it yet"""
+    existing = {
+        column["name"] for column in inspect(connection).get_columns(table_name)
+    }
+    if column_name in existing:
+        return
+    # New NOT NULL columns need a server_default for this to work
+    column = Base.metadata.tables[table_name].columns[column_name]
+    ddl = CreateColumn(column).compile(dialect=connection.dialect)
+    connection.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {ddl}"))
+
+
+def create_index(connection: Connection, table_name: str, index_name: str):
+    """Create an index declared on a model, if it doesn't exist yet"""
+    table = Base.metadata.tables[table_name]
+    index = next(index for index in table.indexes if index.name == index_name)
+    index.create(bind=connection, checkfirst=True)
+
+
+def _add_user_content_version(connection: Connection):
+    add_column(connection, "users", "content_version")
+
+
+def _unique_project_per_repo(connection: Connection):
+    # Keep the newest row of any duplicated repo so the index can be built.
+    # Media of the other rows moves to the kept one first; deleting rows
+    # still referenced would violate the foreign key
+    duplicates = (
+        "SELECT id FROM projects WHERE id NOT IN ("
+        "SELECT MAX(id) FROM projects GROUP BY user_id, github_id)"
+    )
+    connection.execute(text(
+        "UPDATE media SET project_id = ("
+        "SELECT MAX(kept.id) FROM projects duplicate "
+        "JOIN projects kept ON kept.user_id = duplicate.user_id "
+        "AND kept.github_id = duplicate.github_id "
+        "WHERE duplicate.id = media.project_id) "
+        f"WHERE project_id IN ({duplicates})"
+    ))
+    connection.execute(text(f"DELETE FROM projects WHERE id IN ({duplicates})"))
+    create_index(connection, "projects", "uq_projects_user_github")
+
+
+def _hot_query_indexes(connection: Connection):
+    create_index(connection, "projects", "ix_projects_user_visible")
+    create_index(connection, "projects", "ix_projects_user_status")
+    create_index(connection, "media", "ix_media_project_id")
+    create_index(connection, "media", "ix_media_user_project")
+    create_index(connection, "experiences", "ix_experiences_user_id")
+    create_index(connection, "education", "ix_education_user_id")
+    create_index(connection, "skills", "ix_skills_user_id")
+
+
+def _project_sort_indexes(connection: Connection):
+    create_index(connection, "projects", "ix_projects_user_updated")
+    create_index(connection, "projects", "ix_projects_user_stars")
+    create_index(connection, "projects", "ix_projects_user_name")
+
+
+def compress_column(connection: Connection, table_name: str, column_name: str):
+    """
+    Rewrite a column's existing values in CompressedText format.
+    Values are read without the column type, so rows still holding plain
+    text are found; already compressed rows are left alone.
+    """
+    if connection.dialect.name == "postgresql":
+        column_type = next(
+            column["type"] for column in inspect(connection).get_columns(table_name)
+            if column["name"] == column_name
+        )
+        # Only text columns need converting; tables created from the
+        # current models are BYTEA already
+        if isinstance(column_type, String):
+            connection.execute(text(
+                f"ALTER TABLE {table_name} ALTER COLUMN {column_name} TYPE BYTEA "
+                f"USING convert_to({column_name}, 'UTF8')"
+            ))
+
+    last_id = 0
+    while True:
+        rows = connection.execute(text(
+            f"SELECT id, {column_name} FROM {table_name} "
+            f"WHERE id > :last_id AND {column_name} IS NOT NULL "
+            f"ORDER BY id LIMIT 500"
+        ), {"last_id": last_id}).all()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        updates = [
+            {"row_id": row_id, "value": decompress_text(value)}
+            for row_id, value in rows
+            if not is_compressed(value)
+        ]
+        if updates:
+            # The column's CompressedText type compresses on the way in
+            table = Base.metadata.tables[table_name]
+            connection.execute(
+                table.update()
+                .where(table.c.id == bindparam("row_id"))
+                .values({column_name: bindparam("value")}),
+                updates,
+            )
+
+
+def _compress_text_blobs(connection: Connection):
+    compress_column(connection, "projects", "readme_content")
+    compress_column(connection, "users", "resume_text")
+    compress_column(connection, "users", "resume_raw")
+
+
+def _one_active_sync_job_per_user(connection: Connection):
+    # Duplicates left by racing sync requests: the oldest active job of
+    # each user stays, the rest are closed so the index can be built
+    connection.execute(
+        text(
+            "UPDATE sync_jobs SET status = 'failed', finished_at = :now "
+            "WHERE status IN ('queued', 'running') AND id NOT IN ("
+            "SELECT MIN(id) FROM sync_jobs WHERE status IN ('queued', 'running') "
+            "GROUP BY user_id)"
+        ),
+        {"now": datetime.utcnow()},
+    )
+    create_index(connection, "sync_jobs", "uq_sync_jobs_active_user")
+
+
+# (version, name, step) in the order they are applied
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "add users.content_version", _add_user_content_version),
+    (2, "unique project per user and repo", _unique_project_per_repo),
+    (3, "indexes for hot query shapes", _hot_query_indexes),
+    (4, "project list sort indexes", _project_sort_indexes),
+    (5, "compress README and resume text", _compress_text_blobs),
+    (6, "one active sync job per user", _one_active_sync_job_per_user),
+]
+
+
+def run_migrations(engine: Engine) -> List[int]:
+    """
+    Apply pending migrations, each in its own transaction.
+    Returns the versions that were applied.
+    """
+    migration_metadata.create_all(bind=engine)
+
+    with engine.connect() as connection:
+        applied = set(
+            connection.execute(select(schema_migrations.c.version)).scalars()
+        )
+
+    newly_applied = []
+    for version, name, step in MIGRATIONS:
+        if version in applied:
+            continue
+        with engine.begin() as connection:
+            step(connection)
+            connection.execute(schema_migrations.insert().values(
+                version=version, name=name, applied_at=datetime.utcnow(),
+            ))
+        newly_applied.append(version)
+    return newly_applied
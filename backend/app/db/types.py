@@ -0,0 +1,74 @@
+import importlib.util
+import zlib
+from typing import Optional, Union
+
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+from app.core.config import settings
+
+# First byte of every stored value says how the rest is encoded, so rows
+# written with another codec (or before compression) stay readable
+RAW = b"\x00"
+ZLIB = b"\x01"
+ZSTD = b"\x02"
+
+# Shorter values are stored raw; compression wouldn't pay for itself
+MIN_COMPRESS_SIZE = 256
+
+_zstd = None
+if settings.TEXT_COMPRESSION == "zstd":
+    if importlib.util.find_spec("zstandard") is None:
+        print("TEXT_COMPRESSION is zstd but the 'zstandard' package is not installed; using zlib")
+    else:
+        import zstandard as _zstd
+
+
+def compress_text(text: Optional[str]) -> Optional[bytes]:
+    """Encode text for storage in a CompressedText column"""
+    if text is None:
+        return None
+    data = text.encode("utf-8")
+    if len(data) < MIN_COMPRESS_SIZE:
+        return RAW + data
+    if _zstd is not None:
+        return ZSTD + _zstd.ZstdCompressor(level=settings.TEXT_COMPRESSION_LEVEL).compress(data)
+    return ZLIB + zlib.compress(data, settings.TEXT_COMPRESSION_LEVEL)
+
+
+def decompress_text(value: Union[bytes, str, None]) -> Optional[str]:
+    """Decode a stored value; plain text from before compression passes through"""
+    if value is None or isinstance(value, str):
+        return value
+    value = bytes(value)
+    header, data = value[:1], value[1:]
+    if header == RAW:
+        return data.decode("utf-8")
+    if header == ZLIB:
+        return zlib.decompress(data).decode("utf-8")
+    if header == ZSTD:
+        # Needed to read zstd rows even if no longer writing them
+        import zstandard
+        return zstandard.ZstdDecompressor().decompress(data).decode("utf-8")
+    # Uncompressed UTF-8 bytes (e.g. a TEXT column converted to BYTEA)
+    return value.decode("utf-8")
+
+
+def is_compressed(value: Union[bytes, str, None]) -> bool:
+    """Whether a stored value is already in CompressedText format"""
+    return isinstance(value, (bytes, memoryview)) and bytes(value[:1]) in (RAW, ZLIB, ZSTD)
+
+
+class CompressedText(TypeDecorator):
+    """
+    Text column stored compressed (zlib, or zstd if configured and
+    installed). Reads and writes plain str.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return compress_text(value)
+
+    def process_result_value(self, value, dialect):
+        return decompress_text(value)
@@ -1,11 +1,21 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import text
+from fastapi.responses import JSONResponse
 import logging
 
+from app.core.config import settings
+
 from app.db.database import engine, get_db
 from app.db.init_db import init_db
+from app.db.migrations import run_migrations
 from app.api import auth, users, projects, portfolio, resume
+from app.services.github_service import github_service
+from app.services.github_cache import github_cache
+from app.services.sync_jobs import sync_job_queue
+from app.services.portfolio_cache import portfolio_cache
+from app.services.resume_pool import resume_pool
+from app.services.resume_cache import resume_cache
+from app.core.token_cache import token_cache
 
 # Import models to create tables
 import app.models.user
@@ -14,6 +24,10 @@ import app.models.experience
 import app.models.education
 import app.models.skill
 import app.models.media
+import app.models.github_cache
+import app.models.sync_job
+import app.models.portfolio_snapshot
+import app.models.resume_cache
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -34,24 +48,56 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Headroom over MAX_UPLOAD_SIZE for multipart boundaries and headers
+UPLOAD_ENVELOPE_SIZE = 64 * 1024
+
+
+@app.middleware("http")
+async def limit_request_size(request: Request, call_next):
+    """Reject bodies declared larger than an upload may be before reading them"""
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit():
+        if int(content_length) > settings.MAX_UPLOAD_SIZE + UPLOAD_ENVELOPE_SIZE:
+            return JSONResponse(
+                status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+                content={"detail": "Request body too large"},
+            )
+    return await call_next(request)
+
 # Create tables on startup
 @app.on_event("startup")
 async def startup():
-    """Initialize database on startup"""
+    """Initialize database and shared clients on startup"""
     try:
         # Create all tables
-        from app.models import User, Project, Experience, Education, Skill, Media
+        from app.models import (
+            User, Project, Experience, Education, Skill, Media,
+            GitHubCacheEntry, SyncJob, PortfolioSnapshot, ResumeParseCacheEntry,
+        )
         from app.db.database import Base
         Base.metadata.create_all(bind=engine)
-        
-        # Enable foreign keys for SQLite
-        with engine.connect() as connection:
-            connection.execute(text("PRAGMA foreign_keys=ON"))
-            connection.commit()
+        applied = run_migrations(engine)
+        if applied:
+            logger.info(f"Applied schema migrations: {applied}")
         
         logger.info("Database initialized successfully")
-    except Exception as e:
-        logger.error(f"Error during startup: {e}")
+    except Exception:
+        # Serving on a half-migrated schema fails later in confusing ways
+        # (e.g. the sync upsert needs migration 2's unique index)
+        logger.exception("Database initialization failed")
+        raise
+    
+    await github_service.start()
+    await sync_job_queue.start()
+    resume_pool.start()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Release shared resources on shutdown"""
+    await sync_job_queue.stop()
+    await github_service.close()
+    resume_pool.stop()
 
 # Include API routers
 app.include_router(auth.router, prefix="/auth", tags=["auth"])
@@ -72,4 +118,16 @@ async def read_root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "ok", "database": "sqlite"}
+    return {"status": "ok", "database": engine.dialect.name}
+
+@app.get("/metrics")
+async def metrics():
+    """Internal service metrics"""
+    return {
+        "github_client": github_service.get_stats(),
+        "github_cache": github_cache.get_stats(),
+        "portfolio_cache": portfolio_cache.get_stats(),
+        "auth_cache": token_cache.get_stats(),
+        "resume_pool": resume_pool.get_stats(),
+        "resume_cache": resume_cache.get_stats(),
+    }
@@ -4,5 +4,12 @@ from app.models.experience import Experience
 from app.models.education import Education
 from app.models.skill import Skill
 from app.models.media import Media
+from app.models.github_cache import GitHubCacheEntry
+from app.models.sync_job import SyncJob
+from app.models.portfolio_snapshot import PortfolioSnapshot
+from app.models.resume_cache import ResumeParseCacheEntry
 
-__all__ = ["User", "Project", "Experience", "Education", "Skill", "Media"]
\ No newline at end of file
+__all__ = [
+    "User", "Project", "Experience", "Education", "Skill", "Media",
+    "GitHubCacheEntry", "SyncJob", "PortfolioSnapshot", "ResumeParseCacheEntry",
+]
\ No newline at end of file
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text
+from datetime import datetime
+from app.db.database import Base
+
+
+class GitHubCacheEntry(Base):
+    __tablename__ = "github_cache"
+
+    key = Column(String, primary_key=True)  # sha256 of token scope + URL + params
+    url = Column(String, nullable=False)
+    
+    # Validators replayed as If-None-Match / If-Modified-Since
+    etag = Column(String, nullable=True)
+    last_modified = Column(String, nullable=True)
+    
+    body = Column(Text, nullable=False)  # Raw JSON response body
+    size = Column(Integer, nullable=False)  # Body size in bytes
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_used = Column(DateTime, default=datetime.utcnow, index=True)  # LRU order
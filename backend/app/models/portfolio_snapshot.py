@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, String, DateTime, LargeBinary
+from datetime import datetime
+from app.db.database import Base
+
+
+class PortfolioSnapshot(Base):
+    __tablename__ = "portfolio_snapshots"
+
+    portfolio_username = Column(String, primary_key=True)
+    content_version = Column(Integer, default=0, server_default="0", nullable=False)  # User.content_version it was built from
+    body = Column(LargeBinary, nullable=False)  # Serialized public portfolio JSON
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -1,11 +1,23 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, JSON, Index
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 from app.db.database import Base
+from app.db.types import CompressedText
 
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        # One row per GitHub repo per user; target of the sync upsert
+        Index("uq_projects_user_github", "user_id", "github_id", unique=True),
+        # Public portfolio (visible projects) and status-filtered listings
+        Index("ix_projects_user_visible", "user_id", "is_visible"),
+        Index("ix_projects_user_status", "user_id", "status"),
+        # Keyset pagination of a user's projects by each sort key
+        Index("ix_projects_user_updated", "user_id", "updated_at", "id"),
+        Index("ix_projects_user_stars", "user_id", "stars", "id"),
+        Index("ix_projects_user_name", "user_id", "name", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     github_id = Column(Integer, index=True, nullable=False)
@@ -13,7 +25,8 @@ class Project(Base):
     description = Column(String, nullable=True)
     url = Column(String, nullable=False)
     homepage = Column(String, nullable=True)  # Live demo URL
-    readme_content = Column(String, nullable=True)
+    # Large; only loaded on request (undefer / GET /projects/{id}/readme)
+    readme_content = deferred(Column(CompressedText, nullable=True), raiseload=True)
     
     # Tech stack
     languages = Column(JSON, nullable=True)  # {language: percentage}
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON
+from datetime import datetime
+from app.db.database import Base
+from app.db.types import CompressedText
+
+
+class ResumeParseCacheEntry(Base):
+    __tablename__ = "resume_parse_cache"
+
+    key = Column(String, primary_key=True)  # sha256 of file content + parser fingerprint
+    
+    text = Column(CompressedText, nullable=False)  # Extracted text
+    parsed = Column(JSON, nullable=False)  # parse_resume_text() result
+    size = Column(Integer, nullable=False)  # Text + parsed size in bytes
+    
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)  # Age limit
+    last_used = Column(DateTime, default=datetime.utcnow, index=True)  # LRU order
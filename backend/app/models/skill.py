@@ -8,7 +8,7 @@ class Skill(Base):
     __tablename__ = "skills"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     
     name = Column(String, nullable=False, index=True)
     proficiency = Column(String, nullable=True)  # beginner, intermediate, expert
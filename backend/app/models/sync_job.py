@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, JSON, Index, text
+from datetime import datetime
+from app.db.database import Base
+
+
+class SyncJob(Base):
+    __tablename__ = "sync_jobs"
+    __table_args__ = (
+        # At most one queued or running job per user, even when two sync
+        # requests race past enqueue's lookup
+        Index(
+            "uq_sync_jobs_active_user", "user_id", unique=True,
+            sqlite_where=text("status IN ('queued', 'running')"),
+            postgresql_where=text("status IN ('queued', 'running')"),
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    
+    status = Column(String, default="queued", index=True)  # queued, running, completed, failed
+    full = Column(Boolean, default=False)  # Resync unchanged repos too
+    
+    # Progress
+    repos_total = Column(Integer, default=0)
+    repos_done = Column(Integer, default=0)
+    errors = Column(JSON, default=list)  # List of error messages
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
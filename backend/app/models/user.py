@@ -1,7 +1,8 @@
 from sqlalchemy import Column, Integer, String, DateTime, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 from app.db.database import Base
+from app.db.types import CompressedText
 
 
 class User(Base):
@@ -21,12 +22,18 @@ class User(Base):
     access_token = Column(String, nullable=True)
     token_type = Column(String, default="bearer")
     
-    # Resume
-    resume_text = Column(String, nullable=True)
-    resume_raw = Column(String, nullable=True)  # Raw resume content
+    # Resume. Large and only used by the resume endpoints, so they are not
+    # loaded with the user (e.g. on every authenticated request)
+    resume_text = deferred(Column(CompressedText, nullable=True), raiseload=True)
+    resume_raw = deferred(Column(CompressedText, nullable=True), raiseload=True)  # Raw resume content
     
     # Profile visibility
     is_public = Column(Boolean, default=True)
+    
+    # Bumped on every write to the user's public data; drives ETags and
+    # portfolio snapshot validity
+    content_version = Column(Integer, default=1, server_default="1", nullable=False)
+    
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     last_sync = Column(DateTime, nullable=True)  # Last GitHub sync time
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, field_validator
+from typing import Optional, List, Dict
 from datetime import datetime
 
 
@@ -26,11 +26,109 @@ class MediaResponse(MediaBase):
         from_attributes = True
 
 
+class PortfolioMedia(BaseModel):
+    """Media item as shown on a public portfolio"""
+    id: int
+    filename: str
+    file_path: str
+    media_type: str
+    mime_type: Optional[str]
+    title: Optional[str]
+    description: Optional[str]
+    order: Optional[int]
+
+    class Config:
+        from_attributes = True
+
+
+class PortfolioUser(BaseModel):
+    """User public profile"""
+    portfolio_username: str
+    github_username: str
+    bio: Optional[str]
+    location: Optional[str]
+    avatar_url: Optional[str]
+    profile_url: Optional[str]
+    created_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
+
+
+class PortfolioProject(BaseModel):
+    id: int
+    name: str
+    description: Optional[str]
+    url: str
+    deployed_url: Optional[str]
+    status: Optional[str]
+    languages: Optional[Dict[str, int]]
+    stars: Optional[int]
+    forks: Optional[int]
+    media: List[PortfolioMedia]
+
+    class Config:
+        from_attributes = True
+
+
+class PortfolioExperience(BaseModel):
+    id: int
+    title: str
+    company: str
+    location: Optional[str]
+    description: Optional[str]
+    start_date: Optional[datetime]
+    end_date: Optional[datetime]
+    is_current: bool
+
+    @field_validator("is_current", mode="before")
+    @classmethod
+    def coerce_is_current(cls, value):
+        # Nullable column
+        return bool(value)
+
+    class Config:
+        from_attributes = True
+
+
+class PortfolioEducation(BaseModel):
+    id: int
+    school: str
+    degree: Optional[str]
+    field_of_study: Optional[str]
+    description: Optional[str]
+    start_date: Optional[datetime]
+    end_date: Optional[datetime]
+    is_current: bool
+
+    @field_validator("is_current", mode="before")
+    @classmethod
+    def coerce_is_current(cls, value):
+        # Nullable column
+        return bool(value)
+
+    class Config:
+        from_attributes = True
+
+
+class PortfolioSkill(BaseModel):
+    id: int
+    name: str
+    proficiency: Optional[str]
+    category: Optional[str]
+
+    class Config:
+        from_attributes = True
+
+
 class PortfolioResponse(BaseModel):
     """Complete portfolio data for public viewing"""
-    user: dict  # User public profile
-    projects: List[dict]  # Projects list
-    experiences: List[dict]  # Experience list
-    education: List[dict]  # Education list
-    skills: List[dict]  # Skills list
-    media: List[MediaResponse]  # Portfolio media
+    user: PortfolioUser
+    projects: List[PortfolioProject]  # Visible projects only
+    experiences: List[PortfolioExperience]
+    education: List[PortfolioEducation]
+    skills: List[PortfolioSkill]
+    media: List[PortfolioMedia]  # Portfolio-level media
+
+    class Config:
+        from_attributes = True
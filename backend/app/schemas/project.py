@@ -21,7 +21,6 @@ class ProjectResponse(ProjectBase):
     github_id: int
     url: str
     homepage: Optional[str]
-    readme_content: Optional[str]
     languages: Optional[Dict[str, int]]
     stars: int
     forks: int
@@ -40,6 +39,15 @@ class ProjectResponse(ProjectBase):
         from_attributes = True
 
 
+class ProjectReadmeResponse(BaseModel):
+    """README of a project, fetched separately from the project itself"""
+    id: int
+    readme_content: Optional[str]
+
+    class Config:
+        from_attributes = True
+
+
 class ProjectPublicResponse(BaseModel):
     """Public project info (filtered)"""
     id: int
@@ -60,9 +68,26 @@ class ProjectSyncRequest(BaseModel):
     pass
 
 
+class SyncJobResponse(BaseModel):
+    """Background sync job status"""
+    id: int
+    status: str  # queued, running, completed, failed
+    full: bool
+    repos_total: int
+    repos_done: int
+    errors: List[str]
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
+
+
 class ProjectListResponse(BaseModel):
     """Paginated project list"""
     items: List[ProjectResponse]
-    total: int
+    total: Optional[int]  # None when include_total=false
     page: int
     page_size: int
+    next_cursor: Optional[str] = None  # None on the last page
@@ -81,10 +81,10 @@ class SkillResponse(SkillBase):
 
 
 class ResumeParseResponse(BaseModel):
-    """Parsed resume data for user review"""
-    experiences: List[ExperienceResponse] = []
-    education: List[EducationResponse] = []
-    skills: List[SkillResponse] = []
+    """Parsed resume data for user review (not saved yet, so no ids)"""
+    experiences: List[ExperienceBase] = []
+    education: List[EducationBase] = []
+    skills: List[SkillBase] = []
     raw_text: str
 
 
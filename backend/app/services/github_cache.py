@@ -0,0 +1,152 @@
+import hashlib
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any
+
+from sqlalchemy import select, delete, update
+
+from app.core.config import settings
+from app.db.database import AsyncSessionLocal
+from app.models.github_cache import GitHubCacheEntry
+
+
+class GitHubResponseCache:
+    """
+    Persistent cache of GitHub API responses for conditional requests.
+
+    Entries keep the ETag / Last-Modified validators of a response so the
+    next request can be sent as If-None-Match / If-Modified-Since. GitHub
+    answers unchanged resources with 304, which does not count against the
+    rate limit, and the cached body is replayed instead.
+    """
+
+    # How many stores between two eviction passes
+    EVICT_EVERY = 100
+
+    def __init__(self):
+        self.enabled = settings.GITHUB_CACHE_ENABLED
+        self.max_bytes = settings.GITHUB_CACHE_MAX_BYTES
+        self.touch_interval = settings.GITHUB_CACHE_TOUCH_INTERVAL
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._stores_since_evict = 0
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict[str, Any]], access_token: str) -> str:
+        """Key a response by URL, query params and the token that fetched it"""
+        # Different tokens can see different data (private repos), so the
+        # token is part of the key - hashed, never stored
+        scope = hashlib.sha256(access_token.encode()).hexdigest()
+        query = "&".join(f"{k}={v}" for k, v in sorted((params or {}).items()))
+        return hashlib.sha256(f"{scope}|{url}?{query}".encode()).hexdigest()
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response and bump its LRU position. The bump is
+        only written when last_used is older than
+        GITHUB_CACHE_TOUCH_INTERVAL, so most hits are a read alone: a full
+        sync hits the cache for every repo, and eviction only needs a
+        rough order.
+        """
+        if not self.enabled:
+            return None
+
+        async with AsyncSessionLocal() as db:
+            entry = (await db.execute(
+                select(
+                    GitHubCacheEntry.etag,
+                    GitHubCacheEntry.last_modified,
+                    GitHubCacheEntry.body,
+                    GitHubCacheEntry.last_used,
+                ).filter(GitHubCacheEntry.key == key)
+            )).first()
+            if entry is None:
+                return None
+
+            now = datetime.utcnow()
+            touched_before = now - timedelta(seconds=self.touch_interval)
+            if entry.last_used is None or entry.last_used < touched_before:
+                await db.execute(
+                    update(GitHubCacheEntry)
+                    .filter(GitHubCacheEntry.key == key)
+                    .values(last_used=now)
+                    .execution_options(synchronize_session=False)
+                )
+                await db.commit()
+            return {
+                "etag": entry.etag,
+                "last_modified": entry.last_modified,
+                "body": entry.body,
+            }
+
+    async def store(
+        self,
+        key: str,
+        url: str,
+        body: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+    ):
+        """Insert or replace a cached response"""
+        if not self.enabled or not (etag or last_modified):
+            return
+
+        async with AsyncSessionLocal() as db:
+            entry = await db.scalar(
+                select(GitHubCacheEntry).filter(GitHubCacheEntry.key == key)
+            )
+            if entry is None:
+                entry = GitHubCacheEntry(key=key, url=url)
+                db.add(entry)
+
+            entry.etag = etag
+            entry.last_modified = last_modified
+            entry.body = body
+            entry.size = len(body.encode("utf-8"))
+            entry.last_used = datetime.utcnow()
+            await db.commit()
+
+        self._stores_since_evict += 1
+        if self._stores_since_evict >= self.EVICT_EVERY:
+            self._stores_since_evict = 0
+            await self.evict()
+
+    async def evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(
+                select(GitHubCacheEntry.key, GitHubCacheEntry.size)
+                .order_by(GitHubCacheEntry.last_used.desc())
+            )).all()
+
+            total = 0
+            stale_keys = []
+            for key, size in rows:
+                total += size
+                if total > self.max_bytes:
+                    stale_keys.append(key)
+
+            # Chunked to stay under SQLite's bound-parameter limit
+            for start in range(0, len(stale_keys), 500):
+                await db.execute(
+                    delete(GitHubCacheEntry)
+                    .filter(GitHubCacheEntry.key.in_(stale_keys[start:start + 500]))
+                    .execution_options(synchronize_session=False)
+                )
+            await db.commit()
+            self.evictions += len(stale_keys)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+# Global instance
+github_cache = GitHubResponseCache()
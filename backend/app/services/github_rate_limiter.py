@@ -0,0 +1,168 @@
+import asyncio
+import hashlib
+import random
+import time
+from typing import Optional, Dict, Any
+
+import httpx
+
+from app.core.config import settings
+
+# Request priorities: interactive calls (login, profile) may spend the
+# budget reserved by GITHUB_RATE_LIMIT_RESERVE, bulk sync calls may not
+INTERACTIVE = 0
+BULK = 1
+
+
+class GitHubRateLimitError(Exception):
+    """A request could not be sent (or kept failing) because of rate limits"""
+
+
+class _TokenBudget:
+    """What we know about one token's rate limit, from response headers"""
+
+    def __init__(self):
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at: float = 0.0  # epoch seconds
+        self.blocked_until: float = 0.0  # epoch seconds, from Retry-After
+        self.next_bulk_at: float = 0.0  # epoch seconds, for pacing
+
+
+class GitHubRateLimiter:
+    """
+    Per-token rate limit bookkeeping for GitHub API calls.
+
+    Every response updates the token's budget from X-RateLimit-* headers.
+    Before a request is sent, wait() holds it back while the token is
+    blocked (secondary limit / Retry-After), keeps bulk requests away from
+    the reserve left for interactive ones, and paces bulk requests once
+    fewer than GITHUB_RATE_LIMIT_LOW_WATER are left. Waits longer
+    than GITHUB_MAX_BACKOFF raise GitHubRateLimitError instead, so a sync
+    fails visibly rather than stalling for up to an hour.
+
+    Budgets are tracked per process; every worker learns the real numbers
+    from GitHub's own headers on its next response.
+    """
+
+    def __init__(self):
+        self._budgets: Dict[str, _TokenBudget] = {}
+        self.stats = {
+            "waits": 0,
+            "wait_seconds": 0.0,
+            "retries": 0,
+            "rejected": 0,
+        }
+
+    @staticmethod
+    def _key(access_token: str, resource: str) -> str:
+        return f"{resource}:{hashlib.sha256(access_token.encode()).hexdigest()}"
+
+    def _budget(self, access_token: str, resource: str) -> _TokenBudget:
+        # REST ("core") and GraphQL have separate budgets
+        return self._budgets.setdefault(self._key(access_token, resource), _TokenBudget())
+
+    def _pacing_interval(self, budget: _TokenBudget, spendable: int, now: float) -> float:
+        """Seconds between bulk requests, or 0 when there's no need to pace"""
+        # With plenty left a sync is better off finishing quickly; pacing
+        # only starts once the budget runs low, and then spreads what's
+        # left evenly over the time until reset
+        if spendable > settings.GITHUB_RATE_LIMIT_LOW_WATER:
+            return 0.0
+        return (budget.reset_at - now) / spendable
+
+    async def wait(self, access_token: str, priority: int = BULK, resource: str = "core"):
+        """Wait until a request with this token may be sent"""
+        budget = self._budget(access_token, resource)
+        now = time.time()
+        delay = max(budget.blocked_until - now, 0.0)
+        reason = "secondary rate limit"
+
+        if budget.remaining is not None and now < budget.reset_at:
+            reserve = settings.GITHUB_RATE_LIMIT_RESERVE if priority == BULK else 0
+            spendable = budget.remaining - reserve
+            if spendable <= 0:
+                if budget.reset_at - now > delay:
+                    delay = budget.reset_at - now
+                    reason = "rate limit budget spent"
+            elif priority == BULK:
+                interval = self._pacing_interval(budget, spendable, now)
+                if interval > settings.GITHUB_MAX_BACKOFF:
+                    self.stats["rejected"] += 1
+                    raise GitHubRateLimitError(
+                        f"GitHub rate limit too low to continue: {spendable} requests "
+                        f"left until reset in {int(budget.reset_at - now)}s"
+                    )
+                if interval:
+                    send_at = max(budget.next_bulk_at, now)
+                    if send_at - now <= settings.GITHUB_MAX_BACKOFF:
+                        budget.next_bulk_at = send_at + interval
+                    delay = max(delay, send_at - now)
+                    reason = "pacing"
+
+        if delay <= 0:
+            return
+        if delay > settings.GITHUB_MAX_BACKOFF:
+            self.stats["rejected"] += 1
+            raise GitHubRateLimitError(
+                f"GitHub {reason}; retry in {int(delay)}s"
+            )
+        self.stats["waits"] += 1
+        self.stats["wait_seconds"] += delay
+        await asyncio.sleep(delay)
+
+    def update(self, access_token: str, response: httpx.Response, resource: str = "core"):
+        """Record the budget reported by a response"""
+        budget = self._budget(access_token, resource)
+        headers = response.headers
+        try:
+            if "X-RateLimit-Remaining" in headers:
+                budget.remaining = int(headers["X-RateLimit-Remaining"])
+            if "X-RateLimit-Limit" in headers:
+                budget.limit = int(headers["X-RateLimit-Limit"])
+            if "X-RateLimit-Reset" in headers:
+                budget.reset_at = float(headers["X-RateLimit-Reset"])
+        except ValueError:
+            pass
+
+        retry_after = self.retry_after(response)
+        if retry_after is not None:
+            budget.blocked_until = max(budget.blocked_until, time.time() + retry_after)
+
+    @staticmethod
+    def is_rate_limited(response: httpx.Response) -> bool:
+        """Whether a response is a primary or secondary rate limit rejection"""
+        if response.status_code == 429:
+            return True
+        if response.status_code != 403:
+            return False
+        return (
+            "Retry-After" in response.headers
+            or response.headers.get("X-RateLimit-Remaining") == "0"
+            or "rate limit" in response.text.lower()
+        )
+
+    @staticmethod
+    def retry_after(response: httpx.Response) -> Optional[float]:
+        """Retry-After header in seconds, if present and numeric"""
+        value = response.headers.get("Retry-After")
+        if value is None:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            return None
+
+    def backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter for a retry attempt (0-based)"""
+        self.stats["retries"] += 1
+        ceiling = min(settings.GITHUB_BACKOFF_BASE * 2 ** attempt, settings.GITHUB_MAX_BACKOFF)
+        return random.uniform(0, ceiling)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Wait/retry counters"""
+        return {
+            **self.stats,
+            "wait_seconds": round(self.stats["wait_seconds"], 3),
+            "tokens_tracked": len(self._budgets),
+        }
@@ -1,19 +1,242 @@
+import asyncio
+import importlib.util
+import json
 import httpx
 import re
-from typing import Optional, List, Dict, Any
-from datetime import datetime
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Optional, List, Dict, Any, Tuple, Callable, Awaitable
+from datetime import datetime, timezone
 from app.core.config import settings
+from app.services.github_cache import github_cache
+from app.services.github_rate_limiter import (
+    GitHubRateLimiter, GitHubRateLimitError, INTERACTIVE, BULK,
+)
+
+
+# In-flight request limit of the sync the current task belongs to; set by
+# enrich_repos for the tasks it starts
+_sync_limit: ContextVar[Optional[asyncio.Semaphore]] = ContextVar("github_sync_limit", default=None)
+
+# README file names tried, in order, by the GraphQL repository query.
+# Unlike the REST /readme endpoint, GraphQL can only look up exact paths:
+# a README under another name or casing, or one only in docs/ or .github/,
+# is not found in GraphQL mode. Each name adds a lookup per repo, so only
+# the common ones are listed.
+README_ALIASES = {
+    "readmeMd": "README.md",
+    "readmeLowerMd": "readme.md",
+    "readmeTitleMd": "Readme.md",
+    "readmeMarkdown": "README.markdown",
+    "readmeRst": "README.rst",
+    "readmeTxt": "README.txt",
+    "readmePlain": "README",
+}
+
+# Public, non-fork repositories of a user with languages and README text;
+# the REST path needs 2 extra requests per repo for the same data
+REPOS_QUERY = """
+query($login: String!, $pageSize: Int!, $cursor: String) {
+  user(login: $login) {
+    repositories(
+      first: $pageSize
+      after: $cursor
+      privacy: PUBLIC
+      isFork: false
+      ownerAffiliations: OWNER
+      orderBy: {field: UPDATED_AT, direction: DESC}
+    ) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        databaseId
+        name
+        owner { login }
+        description
+        url
+        homepageUrl
+        stargazerCount
+        forkCount
+        watchers { totalCount }
+        isArchived
+        isFork
+        pushedAt
+        updatedAt
+        languages(first: 20, orderBy: {field: SIZE, direction: DESC}) {
+          edges { size node { name } }
+        }
+%s
+      }
+    }
+  }
+}
+""" % "\n".join(
+    f'        {alias}: object(expression: "HEAD:{path}") {{ ... on Blob {{ text }} }}'
+    for alias, path in README_ALIASES.items()
+)
 
 
 class GitHubService:
     """Service for GitHub API interactions"""
     
-    BASE_URL = "https://api.github.com"
     HEADERS = {"Accept": "application/vnd.github.v3+json"}
     
     def __init__(self):
         self.client_id = settings.GITHUB_CLIENT_ID
         self.client_secret = settings.GITHUB_CLIENT_SECRET
+        self.base_url = settings.GITHUB_API_URL.rstrip("/")
+        self.graphql_url = settings.GITHUB_GRAPHQL_URL or f"{self.base_url}/graphql"
+        # Shared by every sync so concurrent users can't flood GitHub together
+        self._global_limit = asyncio.Semaphore(settings.GITHUB_MAX_CONCURRENCY)
+        self.rate_limiter = GitHubRateLimiter()
+        self._client: Optional[httpx.AsyncClient] = None
+        self.stats = {
+            "requests": 0,
+            "connections_opened": 0,
+            "tls_handshakes": 0,
+            "http2_requests": 0,
+        }
+    
+    async def start(self):
+        """Create the shared HTTP client (called at application startup)"""
+        if self._client is not None:
+            return
+        
+        http2 = settings.GITHUB_HTTP2
+        if http2 and importlib.util.find_spec("h2") is None:
+            print("GITHUB_HTTP2 is enabled but the 'h2' package is not installed; using HTTP/1.1")
+            http2 = False
+        
+        self._client = httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=settings.GITHUB_POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.GITHUB_POOL_MAX_KEEPALIVE,
+                keepalive_expiry=settings.GITHUB_POOL_KEEPALIVE_EXPIRY,
+            ),
+            timeout=settings.GITHUB_TIMEOUT,
+        )
+    
+    async def close(self):
+        """Close the shared HTTP client (called at application shutdown)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    async def _trace(self, event: str, info: Dict[str, Any]):
+        """httpcore trace hook used to count new connections vs reused ones"""
+        if event == "connection.connect_tcp.complete":
+            self.stats["connections_opened"] += 1
+        elif event == "connection.start_tls.complete":
+            self.stats["tls_handshakes"] += 1
+        elif event == "http2.send_request_headers.started":
+            self.stats["http2_requests"] += 1
+    
+    @asynccontextmanager
+    async def _sync_slot(self):
+        """
+        Hold a slot of the current sync's limit and of the global one while
+        a request is in flight. Requests outside a sync (login, profile)
+        aren't limited.
+        """
+        user_limit = _sync_limit.get()
+        if user_limit is None:
+            yield
+            return
+        async with user_limit, self._global_limit:
+            yield
+    
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        access_token: Optional[str] = None,
+        priority: int = BULK,
+        resource: str = "core",
+        **kwargs,
+    ) -> httpx.Response:
+        """
+        Send a request through the shared, pooled client.
+        Requests made with an access_token are scheduled against that
+        token's rate limit budget; rate limited responses are retried with
+        jittered backoff and raise GitHubRateLimitError once retries run out.
+        """
+        if self._client is None:
+            # Scripts and workers that bypass the FastAPI lifecycle
+            await self.start()
+        
+        attempt = 0
+        while True:
+            if access_token:
+                await self.rate_limiter.wait(access_token, priority, resource)
+            
+            # Slots are only held while the request is in flight, not
+            # while it waits on the rate limit or backs off
+            async with self._sync_slot():
+                self.stats["requests"] += 1
+                response = await self._client.request(
+                    method, url, extensions={"trace": self._trace}, **kwargs
+                )
+            if access_token:
+                self.rate_limiter.update(access_token, response, resource)
+            
+            if not self.rate_limiter.is_rate_limited(response):
+                return response
+            if attempt >= settings.GITHUB_MAX_RETRIES:
+                raise GitHubRateLimitError(
+                    f"GitHub rate limit: {method} {url} still rejected after {attempt} retries"
+                )
+            # Retry-After / reset waits happen in rate_limiter.wait()
+            await asyncio.sleep(self.rate_limiter.backoff(attempt))
+            attempt += 1
+    
+    async def _get_json(
+        self, url: str, access_token: str, params: Optional[Dict[str, Any]] = None
+    ) -> Tuple[int, Any]:
+        """
+        GET a JSON resource, revalidating against the response cache.
+        A 304 replays the cached body and is reported as a 200.
+        """
+        headers = {**self.HEADERS, "Authorization": f"token {access_token}"}
+        
+        cache_key = github_cache.make_key(url, params, access_token)
+        cached = await github_cache.get(cache_key)
+        if cached:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+        
+        response = await self._request(
+            "GET", url, access_token=access_token, headers=headers, params=params
+        )
+        
+        if response.status_code == 304 and cached:
+            github_cache.hits += 1
+            return 200, json.loads(cached["body"])
+        
+        github_cache.misses += 1
+        if response.status_code != 200:
+            return response.status_code, None
+        
+        await github_cache.store(
+            cache_key,
+            url,
+            response.text,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+        return 200, response.json()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Connection reuse and rate limit metrics for the shared client"""
+        requests = self.stats["requests"]
+        opened = self.stats["connections_opened"]
+        return {
+            **self.stats,
+            "connections_reused": max(requests - opened, 0),
+            "reuse_ratio": round(1 - opened / requests, 4) if requests else None,
+            "rate_limit": self.rate_limiter.get_stats(),
+        }
     
     async def get_oauth_url(self, state: str) -> str:
         """Get GitHub OAuth authorization URL"""
@@ -28,21 +251,20 @@ class GitHubService:
     async def exchange_code_for_token(self, code: str) -> Optional[Dict[str, Any]]:
         """Exchange GitHub OAuth code for access token"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    "https://github.com/login/oauth/access_token",
-                    data={
-                        "client_id": self.client_id,
-                        "client_secret": self.client_secret,
-                        "code": code,
-                    },
-                    headers={"Accept": "application/json"},
-                    timeout=10.0,
-                )
-                
-                if response.status_code == 200:
-                    return response.json()
-                return None
+            response = await self._request(
+                "POST",
+                "https://github.com/login/oauth/access_token",
+                data={
+                    "client_id": self.client_id,
+                    "client_secret": self.client_secret,
+                    "code": code,
+                },
+                headers={"Accept": "application/json"},
+            )
+            
+            if response.status_code == 200:
+                return response.json()
+            return None
         except Exception as e:
             print(f"Error exchanging code for token: {e}")
             return None
@@ -50,102 +272,241 @@ class GitHubService:
     async def get_user_profile(self, access_token: str) -> Optional[Dict[str, Any]]:
         """Fetch user profile from GitHub"""
         try:
-            async with httpx.AsyncClient() as client:
-                headers = {**self.HEADERS, "Authorization": f"token {access_token}"}
-                response = await client.get(
-                    f"{self.BASE_URL}/user",
-                    headers=headers,
-                    timeout=10.0,
-                )
-                
-                if response.status_code == 200:
-                    return response.json()
-                return None
+            headers = {**self.HEADERS, "Authorization": f"token {access_token}"}
+            # A user is waiting on the login redirect
+            response = await self._request(
+                "GET",
+                f"{self.base_url}/user",
+                access_token=access_token,
+                priority=INTERACTIVE,
+                headers=headers,
+            )
+            
+            if response.status_code == 200:
+                return response.json()
+            return None
         except Exception as e:
             print(f"Error fetching user profile: {e}")
             return None
     
     async def get_user_repos(self, access_token: str, username: str) -> List[Dict[str, Any]]:
-        """Fetch all public repositories for a user"""
-        try:
-            repos = []
-            page = 1
-            per_page = 100
+        """
+        Fetch all public repositories for a user.
+        Raises rather than returning a partial list if any page fails.
+        """
+        repos = []
+        page = 1
+        per_page = 100
+        
+        while True:
+            status_code, data = await self._get_json(
+                f"{self.base_url}/users/{username}/repos",
+                access_token,
+                params={"page": page, "per_page": per_page, "sort": "updated"},
+            )
             
-            async with httpx.AsyncClient() as client:
-                headers = {**self.HEADERS, "Authorization": f"token {access_token}"}
-                
-                while True:
-                    response = await client.get(
-                        f"{self.BASE_URL}/users/{username}/repos",
-                        headers=headers,
-                        params={"page": page, "per_page": per_page, "sort": "updated"},
-                        timeout=10.0,
-                    )
-                    
-                    if response.status_code != 200:
-                        break
-                    
-                    data = response.json()
-                    if not data:
-                        break
-                    
-                    repos.extend(data)
-                    page += 1
-                    
-                    # Rate limit: stop after fetching enough repos
-                    if len(repos) > 500:
-                        break
+            if status_code != 200:
+                raise ValueError(
+                    f"GitHub returned {status_code} for page {page} of {username}'s repositories"
+                )
             
-            # Filter out forked and archived repos
-            filtered_repos = [
-                repo for repo in repos
-                if not repo.get("fork", False) and not repo.get("archived", False)
-            ]
+            if not data:
+                break
             
-            return filtered_repos
-        except Exception as e:
-            print(f"Error fetching repositories: {e}")
-            return []
+            repos.extend(data)
+            if len(data) < per_page:
+                break
+            page += 1
+        
+        # Filter out forked and archived repos
+        filtered_repos = [
+            repo for repo in repos
+            if not repo.get("fork", False) and not repo.get("archived", False)
+        ]
+        
+        return filtered_repos
     
-    async def get_repo_languages(self, access_token: str, owner: str, repo: str) -> Dict[str, int]:
-        """Fetch programming languages distribution for a repository"""
-        try:
-            async with httpx.AsyncClient() as client:
-                headers = {**self.HEADERS, "Authorization": f"token {access_token}"}
-                response = await client.get(
-                    f"{self.BASE_URL}/repos/{owner}/{repo}/languages",
-                    headers=headers,
-                    timeout=10.0,
+    async def get_user_repos_graphql(
+        self, access_token: str, username: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch all public repositories for a user through the GraphQL API,
+        GITHUB_GRAPHQL_PAGE_SIZE repos per request, with languages and
+        README included. Repos have the same shape as get_user_repos
+        returns, plus an "enrichment" entry shaped like enrich_repos results.
+        Raises rather than returning a partial list if any page fails.
+        """
+        headers = {"Authorization": f"bearer {access_token}"}
+        repos = []
+        cursor = None
+        
+        while True:
+            response = await self._request(
+                "POST",
+                self.graphql_url,
+                access_token=access_token,
+                resource="graphql",
+                headers=headers,
+                json={
+                    "query": REPOS_QUERY,
+                    "variables": {
+                        "login": username,
+                        "pageSize": settings.GITHUB_GRAPHQL_PAGE_SIZE,
+                        "cursor": cursor,
+                    },
+                },
+            )
+            payload = response.json() if response.status_code == 200 else {}
+            if payload.get("errors") or not (payload.get("data") or {}).get("user"):
+                raise ValueError(
+                    f"GitHub GraphQL returned {response.status_code} for {username}'s "
+                    f"repositories: {payload.get('errors')}"
                 )
-                
-                if response.status_code == 200:
-                    return response.json()
-                return {}
-        except Exception as e:
-            print(f"Error fetching repository languages: {e}")
-            return {}
+            
+            connection = payload["data"]["user"]["repositories"]
+            repos.extend(
+                self._repo_from_graphql(node)
+                for node in connection["nodes"]
+                if not node["isArchived"]
+            )
+            
+            if not connection["pageInfo"]["hasNextPage"]:
+                break
+            cursor = connection["pageInfo"]["endCursor"]
+        
+        return repos
+    
+    @staticmethod
+    def _repo_from_graphql(node: Dict[str, Any]) -> Dict[str, Any]:
+        """GraphQL repository node in REST repo shape"""
+        readme = next(
+            (
+                node[alias]["text"] for alias in README_ALIASES
+                if node.get(alias) and node[alias].get("text") is not None
+            ),
+            None,
+        )
+        return {
+            "id": node["databaseId"],
+            "name": node["name"],
+            "owner": {"login": node["owner"]["login"]},
+            "description": node["description"],
+            "html_url": node["url"],
+            "homepage": node["homepageUrl"],
+            "stargazers_count": node["stargazerCount"],
+            "forks_count": node["forkCount"],
+            "watchers_count": node["watchers"]["totalCount"],
+            "archived": node["isArchived"],
+            "fork": node["isFork"],
+            "pushed_at": node["pushedAt"],
+            "updated_at": node["updatedAt"],
+            "enrichment": {
+                "languages": {
+                    edge["node"]["name"]: edge["size"]
+                    for edge in node["languages"]["edges"]
+                },
+                "readme": readme,
+            },
+        }
+    
+    async def get_repo_languages(self, access_token: str, owner: str, repo: str) -> Dict[str, int]:
+        """
+        Fetch programming languages distribution for a repository.
+        Raises if GitHub doesn't answer with the languages.
+        """
+        status_code, data = await self._get_json(
+            f"{self.base_url}/repos/{owner}/{repo}/languages",
+            access_token,
+        )
+        
+        if status_code != 200:
+            raise ValueError(f"GitHub returned {status_code} for {owner}/{repo} languages")
+        return data
     
     async def get_readme_content(self, access_token: str, owner: str, repo: str) -> Optional[str]:
-        """Fetch README content from a repository"""
-        try:
-            async with httpx.AsyncClient() as client:
-                headers = {**self.HEADERS, "Authorization": f"token {access_token}"}
-                response = await client.get(
-                    f"{self.BASE_URL}/repos/{owner}/{repo}/readme",
-                    headers=headers,
-                    timeout=10.0,
-                )
-                
-                if response.status_code == 200:
-                    # GitHub returns base64 encoded content
-                    import base64
-                    content = response.json().get("content", "")
-                    return base64.b64decode(content).decode("utf-8", errors="ignore")
-                return None
-        except Exception as e:
-            print(f"Error fetching README: {e}")
+        """
+        Fetch README content from a repository; None if it has no README.
+        Raises if GitHub doesn't answer with the README or a 404.
+        """
+        status_code, data = await self._get_json(
+            f"{self.base_url}/repos/{owner}/{repo}/readme",
+            access_token,
+        )
+        
+        if status_code == 404:
             return None
+        if status_code != 200:
+            raise ValueError(f"GitHub returned {status_code} for {owner}/{repo} README")
+        
+        # GitHub returns base64 encoded content
+        import base64
+        content = data.get("content", "")
+        return base64.b64decode(content).decode("utf-8", errors="ignore")
+    
+    async def enrich_repos(
+        self,
+        access_token: str,
+        repos: List[Dict[str, Any]],
+        on_repo_done: Optional[Callable[[int], Awaitable[None]]] = None,
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Fetch languages and README for all repositories concurrently.
+        In-flight requests are bounded per call (one call = one user's sync)
+        and globally across all syncs. Results are returned in repo order;
+        a repo whose languages or README couldn't be fetched gets None.
+        Rate limit errors fail the whole call.
+        on_repo_done(count) is awaited each time another repo finishes.
+        """
+        done = 0
+        
+        async def enrich(repo: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            owner = repo["owner"]["login"]
+            name = repo["name"]
+            try:
+                languages, readme = await asyncio.gather(
+                    self.get_repo_languages(access_token, owner, name),
+                    self.get_readme_content(access_token, owner, name),
+                )
+                enrichment = {"languages": languages, "readme": readme}
+            except GitHubRateLimitError:
+                raise
+            except Exception as e:
+                print(f"Error enriching repository {owner}/{name}: {e}")
+                enrichment = None
+            
+            nonlocal done
+            done += 1
+            if on_repo_done:
+                await on_repo_done(done)
+            return enrichment
+        
+        # Tasks copy the context they're created in, so their requests
+        # share this sync's limit (see _sync_slot)
+        context_token = _sync_limit.set(
+            asyncio.Semaphore(settings.GITHUB_SYNC_CONCURRENCY_PER_USER)
+        )
+        try:
+            tasks = [asyncio.ensure_future(enrich(repo)) for repo in repos]
+        finally:
+            _sync_limit.reset(context_token)
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            # One failure (e.g. rate limit) fails the sync; stop the rest
+            for task in tasks:
+                task.cancel()
+            raise
+    
+    @staticmethod
+    def get_repo_updated_at(repo: Dict[str, Any]) -> Optional[datetime]:
+        """Latest of a repo's pushed_at/updated_at, as naive UTC"""
+        timestamps = []
+        for field in ("pushed_at", "updated_at"):
+            value = repo.get(field)
+            if value:
+                parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+                timestamps.append(parsed.astimezone(timezone.utc).replace(tzinfo=None))
+        return max(timestamps) if timestamps else None
     
     @staticmethod
     def detect_demo_url(homepage: Optional[str], readme: Optional[str]) -> Optional[str]:
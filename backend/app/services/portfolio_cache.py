@@ -0,0 +1,124 @@
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, Dict, Any, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.portfolio_snapshot import PortfolioSnapshot
+from app.models.user import User
+
+
+async def bump_content_version(db: AsyncSession, user_id: int):
+    """
+    Mark a user's public data as changed. Call before committing any write
+    to the user's profile, projects, experience, education, skills or media;
+    it invalidates their ETags and portfolio snapshot in every worker.
+    """
+    await db.execute(
+        update(User)
+        .filter(User.id == user_id)
+        .values(content_version=User.content_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+class PortfolioSnapshotCache:
+    """
+    Pre-serialized public portfolio JSON keyed by portfolio_username.
+
+    Two tiers: an in-process LRU, and optionally the portfolio_snapshots
+    table so a cold worker can serve snapshots built by another one.
+    Each snapshot records the User.content_version it was built from and
+    is only served for that version, so writes never need to reach into
+    other workers' memory.
+
+    The persistent tier uses the caller's session: a request already holds
+    a pooled connection, and opening a second one per request would
+    deadlock the pool under concurrent misses.
+    """
+
+    def __init__(self):
+        self.max_entries = settings.PORTFOLIO_CACHE_SIZE
+        self.persist = settings.PORTFOLIO_CACHE_PERSIST
+        self._entries: "OrderedDict[str, Tuple[int, bytes]]" = OrderedDict()
+        self.hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+
+    async def get(
+        self, db: AsyncSession, portfolio_username: str, content_version: int
+    ) -> Optional[bytes]:
+        """Cached snapshot body for this content version, or None on a miss"""
+        entry = self._entries.get(portfolio_username)
+        if entry is not None:
+            version, body = entry
+            if version == content_version:
+                self._entries.move_to_end(portfolio_username)
+                self.hits += 1
+                return body
+            del self._entries[portfolio_username]
+
+        if self.persist:
+            body = await db.scalar(select(PortfolioSnapshot.body).filter(
+                PortfolioSnapshot.portfolio_username == portfolio_username,
+                PortfolioSnapshot.content_version == content_version,
+            ))
+            if body is not None:
+                self._remember(portfolio_username, content_version, body)
+                self.persistent_hits += 1
+                return body
+
+        self.misses += 1
+        return None
+
+    async def put(
+        self, db: AsyncSession, portfolio_username: str, content_version: int, body: bytes
+    ):
+        """Store a freshly built snapshot in every tier and commit"""
+        self._remember(portfolio_username, content_version, body)
+
+        if self.persist:
+            # Upsert, so concurrent misses for the same portfolio can all
+            # store; a slow request never replaces a newer snapshot
+            insert = postgresql_insert if db.bind.dialect.name == "postgresql" else sqlite_insert
+            stmt = insert(PortfolioSnapshot).values(
+                portfolio_username=portfolio_username,
+                content_version=content_version,
+                body=body,
+                created_at=datetime.utcnow(),
+            )
+            await db.execute(stmt.on_conflict_do_update(
+                index_elements=[PortfolioSnapshot.portfolio_username],
+                set_={
+                    "content_version": stmt.excluded.content_version,
+                    "body": stmt.excluded.body,
+                    "created_at": stmt.excluded.created_at,
+                },
+                where=PortfolioSnapshot.content_version <= stmt.excluded.content_version,
+            ))
+            await db.commit()
+
+    def _remember(self, portfolio_username: str, content_version: int, body: bytes):
+        self._entries[portfolio_username] = (content_version, body)
+        self._entries.move_to_end(portfolio_username)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters"""
+        lookups = self.hits + self.persistent_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "persistent_hits": self.persistent_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.persistent_hits) / lookups, 4) if lookups else None,
+        }
+
+
+# Global instance
+portfolio_cache = PortfolioSnapshotCache()
@@ -0,0 +1,147 @@
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import Optional, Callable, Awaitable
+
+from app.core.config import settings
+from app.models.user import User
+from app.models.project import Project
+from app.services.github_service import github_service
+from app.services.portfolio_cache import bump_content_version
+
+
+async def sync_user_projects(
+    user: User,
+    db: AsyncSession,
+    full: bool = False,
+    on_progress: Optional[Callable[[int, int], Awaitable[None]]] = None,
+):
+    """
+    Sync projects from GitHub for a user.
+    By default only repos whose pushed_at/updated_at moved past the stored
+    github_updated_at are enriched and written; full=True resyncs everything.
+    Repos that fail to enrich are skipped and picked up by the next sync.
+    on_progress(done, total) is awaited as changed repos are enriched.
+    No database connection is held during GitHub requests.
+    Returns the number of projects written.
+    """
+    if not user.access_token:
+        raise ValueError("No GitHub access token available")
+    
+    # Fetch repositories from GitHub
+    if settings.GITHUB_FETCH_MODE == "graphql":
+        # Languages and README come with each repo
+        repos = await github_service.get_user_repos_graphql(
+            user.access_token,
+            user.github_username
+        )
+    else:
+        repos = await github_service.get_user_repos(
+            user.access_token, 
+            user.github_username
+        )
+    
+    # Last known GitHub timestamp of every project we already have
+    known_updated_at = dict((await db.execute(
+        select(Project.github_id, Project.github_updated_at).filter(
+            Project.user_id == user.id
+        )
+    )).all())
+    # Don't keep a pooled connection checked out while enriching
+    await db.commit()
+    
+    changed_repos = []
+    for repo in repos:
+        stored = known_updated_at.get(repo["id"])
+        current = github_service.get_repo_updated_at(repo)
+        if full or stored is None or current is None or current > stored:
+            changed_repos.append(repo)
+    
+    total = len(changed_repos)
+    if on_progress:
+        await on_progress(0, total)
+    
+    if settings.GITHUB_FETCH_MODE == "graphql":
+        enrichments = [repo["enrichment"] for repo in changed_repos]
+        if on_progress:
+            await on_progress(total, total)
+    else:
+        # Fan out languages + README fetches for every changed repo at once
+        enrichments = await github_service.enrich_repos(
+            user.access_token,
+            changed_repos,
+            on_repo_done=(lambda done: on_progress(done, total)) if on_progress else None,
+        )
+    
+    now = datetime.utcnow()
+    rows = []
+    
+    for repo, enrichment in zip(changed_repos, enrichments):
+        if enrichment is None:
+            # Couldn't be fetched: leave the stored row (and its
+            # github_updated_at) as is so the next sync retries the repo
+            continue
+        languages = enrichment["languages"]
+        readme = enrichment["readme"]
+        
+        # Detect demo URL
+        deployed_url = github_service.detect_demo_url(
+            repo.get("homepage"),
+            readme
+        )
+        
+        # Classify project
+        status_type = github_service.classify_project(
+            deployed_url,
+            bool(repo.get("homepage")),
+            repo.get("description")
+        )
+        
+        rows.append({
+            "user_id": user.id,
+            "github_id": repo["id"],
+            "name": repo["name"],
+            "description": repo.get("description"),
+            "url": repo["html_url"],
+            "homepage": repo.get("homepage"),
+            "readme_content": readme,
+            "languages": languages,
+            "stars": repo.get("stargazers_count", 0),
+            "forks": repo.get("forks_count", 0),
+            "watchers": repo.get("watchers_count", 0),
+            "is_deployed": deployed_url is not None,
+            "deployed_url": deployed_url,
+            "status": status_type,
+            "is_archived": repo.get("archived", False),
+            "is_fork": repo.get("fork", False),
+            "github_updated_at": github_service.get_repo_updated_at(repo),
+            "created_at": now,
+            "updated_at": now,
+        })
+    
+    # Insert new projects and update existing ones with one executemany;
+    # existing rows keep their is_visible and created_at
+    if rows:
+        insert = postgresql_insert if db.bind.dialect.name == "postgresql" else sqlite_insert
+        stmt = insert(Project)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Project.user_id, Project.github_id],
+            set_={
+                column: stmt.excluded[column]
+                for column in rows[0]
+                if column not in ("user_id", "github_id", "created_at")
+            },
+        )
+        await db.execute(stmt, rows)
+    
+    # Update last sync time
+    user.last_sync = now
+    if rows:
+        await bump_content_version(db, user.id)
+    
+    # Everything above commits as one transaction
+    await db.commit()
+    
+    return len(rows)
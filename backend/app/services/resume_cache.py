@@ -0,0 +1,131 @@
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, Tuple
+
+from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.resume_cache import ResumeParseCacheEntry
+from app.services.resume_parser import parser_fingerprint
+
+
+class ResumeParseCache:
+    """
+    Persistent cache of resume extraction and parse results, keyed by the
+    SHA-256 of the uploaded file and the parser fingerprint (version,
+    character budget, skill taxonomy).
+
+    Users re-upload the same file while editing their profile; a repeat
+    upload is answered from here without going through the worker pool.
+    Entries expire after RESUME_CACHE_MAX_AGE_DAYS, and least recently
+    used ones are dropped beyond RESUME_CACHE_MAX_BYTES.
+
+    Lookups and stores run in the caller's session rather than a second
+    pooled connection.
+    """
+
+    # How many stores between two eviction passes
+    EVICT_EVERY = 20
+
+    def __init__(self):
+        self.enabled = settings.RESUME_CACHE_ENABLED
+        self.max_bytes = settings.RESUME_CACHE_MAX_BYTES
+        self.max_age = timedelta(days=settings.RESUME_CACHE_MAX_AGE_DAYS)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._stores_since_evict = 0
+
+    @staticmethod
+    def make_key(content_digest: str) -> str:
+        """Key a file's results by its content SHA-256 and the parser fingerprint"""
+        return hashlib.sha256(f"{parser_fingerprint()}|{content_digest}".encode()).hexdigest()
+
+    async def get(self, db: AsyncSession, key: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Cached (text, parsed) for a key, bumping its LRU position (commits)"""
+        if not self.enabled:
+            return None
+
+        entry = await db.scalar(
+            select(ResumeParseCacheEntry).filter(
+                ResumeParseCacheEntry.key == key,
+                ResumeParseCacheEntry.created_at > datetime.utcnow() - self.max_age,
+            )
+        )
+        if entry is None:
+            self.misses += 1
+            return None
+
+        entry.last_used = datetime.utcnow()
+        await db.commit()
+        self.hits += 1
+        return entry.text, entry.parsed
+
+    async def store(self, db: AsyncSession, key: str, text: str, parsed: Dict[str, Any]):
+        """Insert or replace the results for a key (commits)"""
+        if not self.enabled:
+            return
+
+        entry = await db.get(ResumeParseCacheEntry, key)
+        if entry is None:
+            entry = ResumeParseCacheEntry(key=key)
+            db.add(entry)
+
+        entry.text = text
+        entry.parsed = parsed
+        entry.size = len(text.encode("utf-8")) + len(json.dumps(parsed))
+        entry.created_at = entry.last_used = datetime.utcnow()
+        await db.commit()
+
+        self._stores_since_evict += 1
+        if self._stores_since_evict >= self.EVICT_EVERY:
+            self._stores_since_evict = 0
+            await self.evict(db)
+
+    async def evict(self, db: AsyncSession):
+        """Drop expired entries, then least recently used ones until under max_bytes (commits)"""
+        expired = await db.execute(
+            delete(ResumeParseCacheEntry)
+            .filter(ResumeParseCacheEntry.created_at <= datetime.utcnow() - self.max_age)
+            .execution_options(synchronize_session=False)
+        )
+        evicted = expired.rowcount or 0
+
+        rows = (await db.execute(
+            select(ResumeParseCacheEntry.key, ResumeParseCacheEntry.size)
+            .order_by(ResumeParseCacheEntry.last_used.desc())
+        )).all()
+
+        total = 0
+        stale_keys = []
+        for key, size in rows:
+            total += size
+            if total > self.max_bytes:
+                stale_keys.append(key)
+
+        # Chunked to stay under SQLite's bound-parameter limit
+        for start in range(0, len(stale_keys), 500):
+            await db.execute(
+                delete(ResumeParseCacheEntry)
+                .filter(ResumeParseCacheEntry.key.in_(stale_keys[start:start + 500]))
+                .execution_options(synchronize_session=False)
+            )
+        await db.commit()
+        self.evictions += evicted + len(stale_keys)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+# Global instance
+resume_cache = ResumeParseCache()
@@ -1,34 +1,111 @@
 import PyPDF2
 import re
-from typing import Dict, List, Any, Optional
+import zipfile
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 
+from app.core.config import settings
+from app.services.skill_matcher import KeywordMatcher, SkillMatcher, load_skill_taxonomy
+
+PDF_CONTENT_TYPE = "application/pdf"
+DOCX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+PDF_MAGIC = b"%PDF-"
+ZIP_MAGIC = b"PK\x03\x04"
+
+# Bump when a parser change alters results, so parses cached by
+# app.services.resume_cache are redone
+PARSER_VERSION = 1
+
+EDUCATION_KEYWORDS = [
+    "bachelor", "bachelors", "master", "masters", "phd", "degree", "diploma",
+    "b.s.", "m.s.", "m.a.",
+]
+
+# Built once per process (each resume worker builds its own on import)
+skill_matcher = SkillMatcher(load_skill_taxonomy(settings.RESUME_SKILLS_FILE))
+education_matcher = KeywordMatcher.from_terms(EDUCATION_KEYWORDS)
+
+
+def parser_fingerprint() -> str:
+    """Everything other than the file itself that a parse result depends on"""
+    return f"v{PARSER_VERSION}:{settings.RESUME_MAX_CHARS}:{skill_matcher.digest}"
+
+
+def sniff_resume_type(path: str) -> Optional[str]:
+    """Content type of a resume file from its bytes, or None if unsupported"""
+    with open(path, "rb") as f:
+        head = f.read(len(PDF_MAGIC))
+    if head.startswith(PDF_MAGIC):
+        return PDF_CONTENT_TYPE
+    if head.startswith(ZIP_MAGIC):
+        # DOCX is a zip with a word/document.xml part; reads only the
+        # central directory
+        try:
+            with zipfile.ZipFile(path) as archive:
+                if "word/document.xml" in archive.namelist():
+                    return DOCX_CONTENT_TYPE
+        except zipfile.BadZipFile:
+            pass
+    return None
+
 
 class ResumeParser:
     """Service for parsing resume files"""
     
     @staticmethod
-    async def extract_text_from_pdf(file_content: bytes) -> str:
-        """Extract text from PDF file"""
+    def extract_text_from_pdf(path: str, max_chars: Optional[int] = None) -> str:
+        """Extract text from PDF file, stopping after max_chars"""
+        text, _ = ResumeParser.extract_pdf_pages(path, max_chars=max_chars)
+        return text
+    
+    @staticmethod
+    def extract_pdf_pages(
+        path: str,
+        start: int = 0,
+        stop: Optional[int] = None,
+        max_chars: Optional[int] = None,
+    ) -> Tuple[str, int]:
+        """
+        Extract text from pages [start, stop) of a PDF file, one page at a
+        time, stopping once max_chars have been collected. Returns the text
+        and the document's total page count.
+        """
         try:
-            pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text()
-            return text
+            # From an open file, PdfReader reads objects as pages need them;
+            # given a path it would load the whole file into memory first
+            with open(path, "rb") as f:
+                pdf_reader = PyPDF2.PdfReader(f)
+                page_count = len(pdf_reader.pages)
+                parts = []
+                collected = 0
+                for index in range(start, min(stop or page_count, page_count)):
+                    page_text = pdf_reader.pages[index].extract_text()
+                    if not page_text:
+                        continue
+                    parts.append(page_text)
+                    collected += len(page_text)
+                    if max_chars is not None and collected >= max_chars:
+                        break
+            return "\n".join(parts)[:max_chars], page_count
         except Exception as e:
             print(f"Error extracting PDF text: {e}")
-            return ""
+            return "", 0
     
     @staticmethod
-    def extract_text_from_docx(file_content: bytes) -> str:
-        """Extract text from DOCX file"""
+    def extract_text_from_docx(path: str, max_chars: Optional[int] = None) -> str:
+        """Extract text from DOCX file, stopping after max_chars"""
         try:
             from docx import Document
-            import io
-            doc = Document(io.BytesIO(file_content))
-            text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
-            return text
+            doc = Document(path)
+            parts = []
+            collected = 0
+            for paragraph in doc.paragraphs:
+                parts.append(paragraph.text)
+                collected += len(paragraph.text) + 1
+                if max_chars is not None and collected >= max_chars:
+                    break
+            return "\n".join(parts)[:max_chars]
         except Exception as e:
             print(f"Error extracting DOCX text: {e}")
             return ""
@@ -42,37 +119,16 @@ class ResumeParser:
             "skills": [],
         }
         
-        # Extract skills (simple approach)
-        skills_keywords = [
-            "python", "javascript", "java", "c++", "c#", "go", "rust",
-            "react", "vue", "angular", "nodejs", "fastapi", "django",
-            "sql", "postgresql", "mongodb", "redis",
-            "aws", "gcp", "azure", "docker", "kubernetes",
-            "git", "ci/cd", "agile", "rest api", "graphql",
-            "html", "css", "scss", "typescript",
-            "machine learning", "tensorflow", "pytorch", "nlp",
-        ]
-        
-        text_lower = text.lower()
-        found_skills = set()
-        
-        for skill in skills_keywords:
-            if skill in text_lower:
-                found_skills.add(skill)
-        
-        result["skills"] = [{"name": skill} for skill in sorted(found_skills)]
+        # Extract skills: whole-token matches against the skill taxonomy
+        result["skills"] = skill_matcher.find_skills(text)
         
         # Extract work experience using patterns
         # Looks for patterns like "Company Name | Title | Dates"
         experience_pattern = r"(.+?)\s*\|?\s*(.+?)\s*\|?\s*(\d{1,2}/\d{1,2}/\d{4})\s*[-–]\s*(\d{1,2}/\d{1,2}/\d{4}|Present)"
         
         # Extract education
-        education_keywords = ["bachelor", "master", "phd", "degree", "diploma", "b.s.", "m.s.", "m.a."]
-        education_lines = []
-        
         for line in text.split("\n"):
-            if any(keyword in line.lower() for keyword in education_keywords):
-                education_lines.append(line.strip())
+            if education_matcher.search(line):
                 result["education"].append({
                     "school": line.strip(),
                     "degree": "Not specified"
@@ -95,5 +151,23 @@ class ResumeParser:
         return match.group(0) if match else None
 
 
-import io
 resume_parser = ResumeParser()
+
+
+def extract_and_parse(
+    path: str, content_type: str, max_chars: Optional[int] = None
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Extract a resume's text (up to max_chars) and parse it. CPU-bound;
+    runs in the resume worker processes (app.services.resume_pool), never
+    on the event loop. Takes the path of the uploaded file so the content
+    isn't copied into the worker.
+    """
+    if content_type == PDF_CONTENT_TYPE:
+        text = resume_parser.extract_text_from_pdf(path, max_chars)
+    else:  # DOCX
+        text = resume_parser.extract_text_from_docx(path, max_chars)
+    
+    if not text:
+        return "", {}
+    return text, resume_parser.parse_resume_text(text)
@@ -0,0 +1,262 @@
+import asyncio
+import multiprocessing
+from collections import deque
+from typing import Optional, Dict, Any, List, Tuple
+
+from app.core.config import settings
+from app.services.resume_parser import ResumeParser, PDF_CONTENT_TYPE, extract_and_parse
+
+
+class ResumePoolBusy(Exception):
+    """Too many resumes are already queued or being processed"""
+
+
+class ResumeProcessingError(Exception):
+    """A resume could not be processed (timeout, memory cap, crash)"""
+
+
+class _WorkerDied(Exception):
+    """A worker process exited in the middle of a call"""
+
+
+def _limit_worker_memory(max_memory_mb: int):
+    """Cap the worker's address space"""
+    try:
+        import resource
+    except ImportError:  # not available on Windows
+        return
+    limit = max_memory_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _worker_main(conn, max_memory_mb: int):
+    """Worker process: run (func, args) calls from the pipe until it closes"""
+    _limit_worker_memory(max_memory_mb)
+    while True:
+        try:
+            func, args = conn.recv()
+        except EOFError:
+            return
+        try:
+            result = (True, func(*args))
+        except BaseException as e:
+            result = (False, e)
+        try:
+            conn.send(result)
+        except Exception as e:
+            # e.g. an exception that can't be pickled
+            conn.send((False, RuntimeError(f"{type(e).__name__}: {e}")))
+
+
+class _Worker:
+    """One worker process and the pipe to it; runs one call at a time"""
+
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_conn, settings.RESUME_WORKER_MAX_MEMORY_MB),
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+
+    def call(self, func, args: tuple) -> Tuple[bool, Any]:
+        """Send a call and wait for (ok, result or exception). Blocking; run in a thread"""
+        try:
+            self.conn.send((func, args))
+            return self.conn.recv()
+        except (EOFError, OSError):
+            raise _WorkerDied()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+
+    def close(self):
+        self.kill()
+        self.conn.close()
+
+
+class ResumeProcessPool:
+    """
+    Bounded pool of worker processes for resume text extraction and parsing.
+
+    PDF/DOCX extraction is CPU-bound and can take seconds, so it runs in
+    separate processes to keep the event loop free. At most
+    RESUME_MAX_PENDING uploads are queued or running at once; beyond that
+    submit() raises ResumePoolBusy. Each upload gets RESUME_JOB_TIMEOUT
+    seconds and workers are capped at RESUME_WORKER_MAX_MEMORY_MB.
+
+    Every worker runs one call at a time over its own pipe, so a call that
+    times out or crashes its process only costs that one worker, which is
+    replaced; calls running in the other workers are unaffected.
+
+    Only the first RESUME_MAX_CHARS characters of a resume are extracted.
+    If RESUME_PDF_PAGES_PER_JOB is set, PDFs longer than that are
+    extracted in page ranges spread over the workers.
+    """
+
+    def __init__(self):
+        # spawn: forking a process with a running event loop and database
+        # threads is unsafe
+        self._context = multiprocessing.get_context("spawn")
+        self._idle: List[_Worker] = []
+        self._busy: set = set()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._pending = 0
+        self.stats = {
+            "completed": 0,
+            "rejected": 0,
+            "timeouts": 0,
+            "failures": 0,
+            "workers_replaced": 0,
+        }
+
+    def start(self):
+        """Start the worker processes (called at application startup)"""
+        if self._slots is not None:
+            return
+        self._slots = asyncio.Semaphore(settings.RESUME_WORKERS)
+        self._idle = [_Worker(self._context) for _ in range(settings.RESUME_WORKERS)]
+
+    def stop(self):
+        """Kill the worker processes (called at application shutdown)"""
+        for worker in [*self._idle, *self._busy]:
+            worker.close()
+        self._idle = []
+        self._busy = set()
+        self._slots = None
+
+    async def submit(self, path: str, content_type: str) -> Tuple[str, Dict[str, Any]]:
+        """Extract and parse a resume file in a worker process"""
+        if self._pending >= settings.RESUME_MAX_PENDING:
+            self.stats["rejected"] += 1
+            raise ResumePoolBusy()
+
+        if self._slots is None:
+            # Scripts and workers that bypass the FastAPI lifecycle
+            self.start()
+
+        self._pending += 1
+        deadline = asyncio.get_running_loop().time() + settings.RESUME_JOB_TIMEOUT
+        try:
+            result = await self._process(path, content_type, deadline)
+            self.stats["completed"] += 1
+            return result
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            raise ResumeProcessingError("Resume processing timed out")
+        except MemoryError:
+            self.stats["failures"] += 1
+            raise ResumeProcessingError("Resume too large to process")
+        except _WorkerDied:
+            # e.g. killed by the OS for exceeding the memory cap
+            self.stats["failures"] += 1
+            raise ResumeProcessingError("Resume processing failed")
+        finally:
+            self._pending -= 1
+
+    async def _call(self, deadline: float, func, *args):
+        """
+        Run func(*args) in an idle worker. If the deadline (event loop time)
+        passes first, the worker is killed and asyncio.TimeoutError raised.
+        A call cancelled from outside keeps its worker until it finishes.
+        """
+        loop = asyncio.get_running_loop()
+        slots = self._slots
+        await asyncio.wait_for(slots.acquire(), timeout=max(deadline - loop.time(), 0))
+
+        worker = self._idle.pop() if self._idle else _Worker(self._context)
+        self._busy.add(worker)
+        running = asyncio.ensure_future(asyncio.to_thread(worker.call, func, args))
+        running.add_done_callback(lambda future: self._release(slots, worker, future))
+
+        try:
+            ok, value = await asyncio.wait_for(
+                asyncio.shield(running), timeout=max(deadline - loop.time(), 0)
+            )
+        except asyncio.TimeoutError:
+            # A running call can't be interrupted; its worker is replaced
+            # once the thread waiting on it sees the process exit
+            worker.kill()
+            raise
+        if not ok:
+            raise value
+        return value
+
+    def _release(self, slots: asyncio.Semaphore, worker: _Worker, running: asyncio.Future):
+        """Free a finished call's slot; keep its worker unless it died or was killed"""
+        self._busy.discard(worker)
+        if slots is self._slots and not running.cancelled() and running.exception() is None:
+            self._idle.append(worker)
+        else:
+            worker.close()
+            if slots is self._slots:
+                self.stats["workers_replaced"] += 1
+        slots.release()
+
+    async def _process(
+        self, path: str, content_type: str, deadline: float
+    ) -> Tuple[str, Dict[str, Any]]:
+        max_chars = settings.RESUME_MAX_CHARS
+        pages_per_job = settings.RESUME_PDF_PAGES_PER_JOB
+        if content_type != PDF_CONTENT_TYPE or not pages_per_job or settings.RESUME_WORKERS < 2:
+            return await self._call(deadline, extract_and_parse, path, content_type, max_chars)
+
+        text = await self._extract_pdf(path, pages_per_job, max_chars, deadline)
+        if not text:
+            return "", {}
+        return text, await self._call(deadline, ResumeParser.parse_resume_text, text)
+
+    async def _extract_pdf(
+        self, path: str, pages_per_job: int, max_chars: int, deadline: float
+    ) -> str:
+        """
+        Extract a PDF in ranges of pages_per_job pages, in page order, with
+        at most RESUME_WORKERS ranges in flight. Stops handing out ranges
+        once max_chars have been collected, so a long document costs about
+        as much as its first max_chars.
+        """
+        # The first range also tells us how many pages there are
+        text, page_count = await self._call(
+            deadline, ResumeParser.extract_pdf_pages, path, 0, pages_per_job, max_chars
+        )
+        parts = [text] if text else []
+        collected = len(text)
+        starts = iter(range(pages_per_job, page_count, pages_per_job))
+        in_flight = deque()
+
+        def submit_next():
+            start = next(starts, None)
+            if start is not None:
+                in_flight.append(asyncio.ensure_future(self._call(
+                    deadline,
+                    ResumeParser.extract_pdf_pages, path, start, start + pages_per_job, max_chars,
+                )))
+
+        try:
+            if collected < max_chars:
+                for _ in range(settings.RESUME_WORKERS):
+                    submit_next()
+            while in_flight and collected < max_chars:
+                text, _ = await in_flight.popleft()
+                if text:
+                    parts.append(text)
+                    collected += len(text)
+                if collected < max_chars:
+                    submit_next()
+        finally:
+            # Ranges past the budget that haven't started are dropped;
+            # running ones finish in the background
+            for future in in_flight:
+                future.cancel()
+        return "\n".join(parts)[:max_chars]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth and outcome counters"""
+        return {**self.stats, "pending": self._pending, "busy_workers": len(self._busy)}
+
+
+# Global instance
+resume_pool = ResumeProcessPool()
@@ -0,0 +1,110 @@
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+DEFAULT_TAXONOMY_PATH = Path(__file__).resolve().parent.parent / "data" / "skills.json"
+
+# A term only matches as a whole token: not preceded or followed by a word
+# character. Plain \b doesn't work for terms that start or end with
+# punctuation, like "c++", "c#" or ".net"
+_TOKEN_START = r"(?<!\w)"
+_TOKEN_END = r"(?!\w)"
+
+
+def _trie_regex(terms: Iterable[str]) -> str:
+    """
+    Regex matching any of the terms, built from their prefix trie so a
+    match attempt costs one walk down the trie rather than one try per
+    term, whatever the number of terms. Longer terms are preferred.
+    """
+    trie: Dict[str, dict] = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}  # end of a term
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        if len(branches) == 1 and "" not in node:
+            return branches[0]
+        pattern = "(?:" + "|".join(branches) + ")"
+        return pattern + "?" if "" in node else pattern
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """
+    Finds whole-token occurrences of many keywords (with aliases) in one
+    pass over the text. Matching is case-insensitive; results are the
+    canonical names.
+    """
+
+    def __init__(self, aliases: Dict[str, str]):
+        # lowercased term or alias -> canonical name
+        self.aliases = {term.lower(): name for term, name in aliases.items()}
+        self.pattern: Optional[re.Pattern] = None
+        if self.aliases:
+            self.pattern = re.compile(
+                _TOKEN_START + "(?:" + _trie_regex(self.aliases) + ")" + _TOKEN_END
+            )
+
+    @classmethod
+    def from_terms(cls, terms: Iterable[str]) -> "KeywordMatcher":
+        return cls({term: term for term in terms})
+
+    def find_all(self, text: str) -> List[str]:
+        """Canonical names of every keyword in the text, in order of first appearance"""
+        if self.pattern is None:
+            return []
+        found = {}
+        for match in self.pattern.finditer(text.lower()):
+            found.setdefault(self.aliases[match.group(0)], None)
+        return list(found)
+
+    def search(self, text: str) -> bool:
+        """Whether any keyword occurs in the text"""
+        return self.pattern is not None and self.pattern.search(text.lower()) is not None
+
+
+def load_skill_taxonomy(path: Optional[str] = None) -> List[Dict[str, object]]:
+    """
+    Skills from a JSON taxonomy file: a list of
+    {"name": ..., "aliases": [...], "category": ...} objects (aliases and
+    category optional). Defaults to the bundled app/data/skills.json.
+    """
+    with open(path or DEFAULT_TAXONOMY_PATH, encoding="utf-8") as f:
+        skills = json.load(f)
+    if not isinstance(skills, list) or not all(
+        isinstance(skill, dict) and skill.get("name") for skill in skills
+    ):
+        raise ValueError(f"Invalid skill taxonomy: {path or DEFAULT_TAXONOMY_PATH}")
+    return skills
+
+
+class SkillMatcher(KeywordMatcher):
+    """KeywordMatcher over a skill taxonomy; also knows each skill's category"""
+
+    def __init__(self, skills: List[Dict[str, object]]):
+        # Changes whenever the taxonomy does
+        self.digest = hashlib.sha256(json.dumps(skills, sort_keys=True).encode()).hexdigest()
+        aliases: Dict[str, str] = {}
+        self.categories: Dict[str, Optional[str]] = {}
+        for skill in skills:
+            name = skill["name"]
+            self.categories[name] = skill.get("category")
+            for term in [name, *skill.get("aliases", [])]:
+                aliases.setdefault(term.lower(), name)
+        super().__init__(aliases)
+
+    def find_skills(self, text: str) -> List[Dict[str, Optional[str]]]:
+        """Skills mentioned in the text, as {"name", "category"} dicts sorted by name"""
+        return [
+            {"name": name, "category": self.categories[name]}
+            for name in sorted(self.find_all(text))
+        ]
@@ -0,0 +1,198 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import Optional, List
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.database import AsyncSessionLocal
+from app.models.sync_job import SyncJob
+from app.models.user import User
+from app.services.project_sync import sync_user_projects
+
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+class SyncJobQueue:
+    """
+    Database-backed queue of GitHub sync jobs processed by async workers.
+
+    Jobs are rows in the sync_jobs table, so anything queued or running when
+    the process stops is picked up again on the next startup.
+    """
+
+    # Minimum seconds between two progress writes for a running job
+    PROGRESS_INTERVAL = 1.0
+
+    def __init__(self):
+        self._workers: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+
+    async def start(self):
+        """Requeue interrupted jobs and start the worker pool"""
+        if self._workers:
+            return
+
+        async with AsyncSessionLocal() as db:
+            # Jobs that were running when the process died start over
+            await db.execute(
+                update(SyncJob)
+                .filter(SyncJob.status == "running")
+                .values(status="queued", started_at=None)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+
+        self._wakeup = asyncio.Event()
+        self._workers = [
+            asyncio.create_task(self._worker())
+            for _ in range(settings.SYNC_WORKERS)
+        ]
+
+    async def stop(self):
+        """Cancel workers; their running jobs are requeued on next start"""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def enqueue(self, db: AsyncSession, user_id: int, full: bool = False) -> SyncJob:
+        """Queue a sync for a user, reusing their queued/running job if any"""
+        active = select(SyncJob).filter(
+            SyncJob.user_id == user_id,
+            SyncJob.status.in_(ACTIVE_STATUSES),
+        )
+        job = await db.scalar(active)
+
+        if job:
+            if full and job.status == "queued" and not job.full:
+                job.full = True
+                await db.commit()
+                await db.refresh(job)
+            return job
+
+        job = SyncJob(user_id=user_id, full=full, status="queued", errors=[])
+        db.add(job)
+        try:
+            await db.commit()
+        except IntegrityError:
+            # A concurrent request queued one first; the partial unique
+            # index uq_sync_jobs_active_user allows one active job per user
+            await db.rollback()
+            existing = await db.scalar(active)
+            if existing is None:
+                raise
+            return existing
+        await db.refresh(job)
+
+        if self._wakeup:
+            self._wakeup.set()
+        return job
+
+    async def _claim_next(self) -> Optional[int]:
+        """Atomically move the oldest queued job to running"""
+        async with AsyncSessionLocal() as db:
+            job_id = await db.scalar(
+                select(SyncJob.id)
+                .filter(SyncJob.status == "queued")
+                .order_by(SyncJob.id)
+                .limit(1)
+            )
+            if job_id is None:
+                return None
+
+            # Conditional update so two processes can't claim the same job
+            result = await db.execute(
+                update(SyncJob)
+                .filter(SyncJob.id == job_id, SyncJob.status == "queued")
+                .values(status="running", started_at=datetime.utcnow())
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+            return job_id if result.rowcount else None
+
+    async def _worker(self):
+        while True:
+            self._wakeup.clear()
+            job_id = await self._claim_next()
+            if job_id is None:
+                try:
+                    await asyncio.wait_for(
+                        self._wakeup.wait(), timeout=settings.SYNC_POLL_INTERVAL
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                await self._run(job_id)
+            except Exception as e:
+                # Keep the worker alive; the job must not stay "running"
+                print(f"Sync job {job_id} crashed: {e}")
+                await self._mark_failed(job_id, str(e))
+
+    async def _mark_failed(self, job_id: int, error: str):
+        """Record a job as failed from a fresh session"""
+        try:
+            async with AsyncSessionLocal() as db:
+                job = await db.get(SyncJob, job_id)
+                if job is None or job.status not in ACTIVE_STATUSES:
+                    return
+                job.status = "failed"
+                job.errors = [*(job.errors or []), error]
+                job.finished_at = datetime.utcnow()
+                await db.commit()
+        except Exception as e:
+            # e.g. the database is unreachable; the job is requeued on
+            # the next startup
+            print(f"Could not mark sync job {job_id} as failed: {e}")
+
+    async def _run(self, job_id: int):
+        async with AsyncSessionLocal() as db:
+            job = await db.get(SyncJob, job_id)
+            if job is None:
+                print(f"Sync job {job_id} no longer exists")
+                return
+            user = await db.get(User, job.user_id)
+            # End the read transaction so the connection goes back to the
+            # pool while the sync talks to GitHub
+            await db.commit()
+
+            last_write = 0.0
+            # Repos finish concurrently; one AsyncSession can't run two
+            # commits at once
+            commit_lock = asyncio.Lock()
+
+            async def on_progress(done: int, total: int):
+                nonlocal last_write
+                job.repos_done = done
+                job.repos_total = total
+                now = time.monotonic()
+                if done == total or now - last_write >= self.PROGRESS_INTERVAL:
+                    last_write = now
+                    async with commit_lock:
+                        await db.commit()
+
+            try:
+                if user is None:
+                    raise ValueError("User not found")
+                await sync_user_projects(user, db, full=job.full, on_progress=on_progress)
+                job.status = "completed"
+            except Exception as e:
+                await db.rollback()
+                # The rollback expired the job; reload it before writing
+                await db.refresh(job)
+                print(f"Sync job {job_id} failed: {e}")
+                job.status = "failed"
+                job.errors = [*(job.errors or []), str(e)]
+
+            job.finished_at = datetime.utcnow()
+            await db.commit()
+
+
+# Global instance
+sync_job_queue = SyncJobQueue()
@@ -0,0 +1,19 @@
+"""
+Benchmarks for the hot paths, run from the backend directory, e.g.
+
+    python -m benchmarks.sync_enrichment
+
+Each one prints a table. They use a throwaway SQLite database (set
+BENCH_DATABASE_URL to use another one) and an in-process fake GitHub, so
+no credentials or network access are needed.
+"""
+import os
+import tempfile
+
+# Settings and the database engines are created when app is first imported
+_tmp_dir = tempfile.mkdtemp(prefix="onelink-bench-")
+os.environ.setdefault("GITHUB_CLIENT_ID", "bench-client-id")
+os.environ.setdefault("GITHUB_CLIENT_SECRET", "bench-client-secret")
+os.environ["DATABASE_URL"] = (
+    os.environ.get("BENCH_DATABASE_URL") or f"sqlite:///{_tmp_dir}/bench.db"
+)
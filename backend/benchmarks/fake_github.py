@@ -0,0 +1,99 @@
+import asyncio
+import base64
+import json
+from typing import Dict, List
+
+import httpx
+
+from app.core.config import settings
+from app.services.github_service import README_ALIASES, github_service
+
+
+class FakeGitHub:
+    """
+    In-process GitHub API with a fixed per-request latency, serving one
+    user's repositories over REST and GraphQL. Plug it into
+    github_service with install().
+    """
+
+    def __init__(self, repo_count: int, latency: float = 0.02, username: str = "alice"):
+        self.username = username
+        self.latency = latency
+        self.requests = 0
+        self.repos = [self._repo(i) for i in range(repo_count)]
+
+    def _repo(self, i: int) -> Dict:
+        return {
+            "id": 10_000 + i,
+            "name": f"repo-{i}",
+            "owner": {"login": self.username},
+            "description": f"Repository number {i}",
+            "html_url": f"https://github.com/{self.username}/repo-{i}",
+            "homepage": f"https://repo-{i}.vercel.app" if i % 5 == 0 else None,
+            "stargazers_count": i % 40,
+            "forks_count": i % 7,
+            "watchers_count": i % 40,
+            "archived": False,
+            "fork": False,
+            "pushed_at": "2024-05-01T10:00:00Z",
+            "updated_at": "2024-05-01T10:00:00Z",
+        }
+
+    def readme(self, repo: Dict) -> str:
+        return f"# {repo['name']}\n\n" + "Some documentation. " * 50
+
+    def install(self):
+        github_service._client = httpx.AsyncClient(transport=httpx.MockTransport(self.handle))
+        github_service._global_limit = asyncio.Semaphore(settings.GITHUB_MAX_CONCURRENCY)
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+        path = request.url.path
+        if path == "/graphql":
+            return httpx.Response(200, json=self._graphql(json.loads(request.content)))
+        if path == f"/users/{self.username}/repos":
+            page = int(request.url.params.get("page", 1))
+            per_page = int(request.url.params.get("per_page", 30))
+            return httpx.Response(200, json=self.repos[(page - 1) * per_page:page * per_page])
+        name = path.split("/")[3]
+        repo = next(repo for repo in self.repos if repo["name"] == name)
+        if path.endswith("/languages"):
+            return httpx.Response(200, json={"Python": 4000, "HTML": 200})
+        content = base64.b64encode(self.readme(repo).encode()).decode()
+        return httpx.Response(200, json={"content": content, "encoding": "base64"})
+
+    def _graphql(self, body: Dict) -> Dict:
+        variables = body["variables"]
+        start = int(variables["cursor"] or 0)
+        page: List[Dict] = self.repos[start:start + variables["pageSize"]]
+        readme_alias = next(iter(README_ALIASES))
+        nodes = [
+            {
+                "databaseId": repo["id"],
+                "name": repo["name"],
+                "owner": repo["owner"],
+                "description": repo["description"],
+                "url": repo["html_url"],
+                "homepageUrl": repo["homepage"],
+                "stargazerCount": repo["stargazers_count"],
+                "forkCount": repo["forks_count"],
+                "watchers": {"totalCount": repo["watchers_count"]},
+                "isArchived": False,
+                "isFork": False,
+                "pushedAt": repo["pushed_at"],
+                "updatedAt": repo["updated_at"],
+                "languages": {"edges": [
+                    {"size": 4000, "node": {"name": "Python"}},
+                    {"size": 200, "node": {"name": "HTML"}},
+                ]},
+                **{alias: None for alias in README_ALIASES},
+                readme_alias: {"text": self.readme(repo)},
+            }
+            for repo in page
+        ]
+        end = start + len(page)
+        return {"data": {"user": {"repositories": {
+            "pageInfo": {"hasNextPage": end < len(self.repos), "endCursor": str(end)},
+            "nodes": nodes,
+        }}}}
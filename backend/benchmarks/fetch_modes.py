@@ -0,0 +1,61 @@
+"""
+GitHub requests and wall time of a full sync in each GITHUB_FETCH_MODE:
+REST (repo list plus languages and README requests per repo) vs GraphQL
+(GITHUB_GRAPHQL_PAGE_SIZE repos per request with both included), against
+an in-process fake GitHub with 20 ms per request.
+
+    python -m benchmarks.fetch_modes
+"""
+import asyncio
+import time
+
+from sqlalchemy import delete
+
+from benchmarks.fake_github import FakeGitHub
+from app.core.config import settings
+from app.db.database import AsyncSessionLocal, Base, engine
+from app.db.migrations import run_migrations
+from app.models import Project, User
+from app.services.github_cache import github_cache
+from app.services.project_sync import sync_user_projects
+
+REPO_COUNTS = (10, 100, 500)
+LATENCY = 0.02
+
+
+async def timed_sync(db, user, count: int, mode: str):
+    """(GitHub requests, seconds) of a full sync from an empty projects table"""
+    await db.execute(delete(Project))
+    await db.commit()
+    settings.GITHUB_FETCH_MODE = mode
+    fake = FakeGitHub(count, latency=LATENCY)
+    fake.install()
+    started = time.perf_counter()
+    assert await sync_user_projects(user, db, full=True) == count
+    return fake.requests, time.perf_counter() - started
+
+
+async def main():
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    github_cache.enabled = False
+
+    async with AsyncSessionLocal() as db:
+        user = User(github_id=1, github_username="alice", portfolio_username="alice",
+                    access_token="gho_bench")
+        db.add(user)
+        await db.commit()
+
+        print(f"{LATENCY * 1000:.0f} ms per request, GraphQL page size "
+              f"{settings.GITHUB_GRAPHQL_PAGE_SIZE}, REST concurrency "
+              f"{settings.GITHUB_SYNC_CONCURRENCY_PER_USER} per sync")
+        print(f"{'repos':>6} {'REST reqs':>10} {'REST s':>8} {'GraphQL reqs':>13} {'GraphQL s':>10}")
+        for count in REPO_COUNTS:
+            rest_requests, rest_seconds = await timed_sync(db, user, count, "rest")
+            graphql_requests, graphql_seconds = await timed_sync(db, user, count, "graphql")
+            print(f"{count:>6} {rest_requests:>10} {rest_seconds:>8.2f} "
+                  f"{graphql_requests:>13} {graphql_seconds:>10.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
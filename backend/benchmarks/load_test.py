@@ -0,0 +1,137 @@
+"""
+Load test: 50 concurrent clients against a real uvicorn server for a
+mix of authenticated and public requests, reporting requests/sec and
+latency per endpoint. Every request goes through the async database
+session; the project list counts and pages on each request, so it hits
+the database every time.
+
+    python -m benchmarks.load_test
+
+The server runs in its own process on the benchmark database.
+"""
+import asyncio
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+import httpx
+from sqlalchemy import insert
+
+from app.core.security import create_access_token
+from app.db.database import AsyncSessionLocal, Base, engine
+from app.db.migrations import run_migrations
+from app.models import Project, User
+
+CLIENTS = 50
+DURATION = 10.0  # seconds
+USERS = 20
+PROJECTS_PER_USER = 50
+
+
+async def seed():
+    async with AsyncSessionLocal() as db:
+        await db.execute(insert(User), [
+            {"id": i, "github_id": i, "github_username": f"user{i}",
+             "portfolio_username": f"user{i}", "access_token": "gho_bench"}
+            for i in range(1, USERS + 1)
+        ])
+        await db.execute(insert(Project), [
+            {"user_id": user_id, "github_id": user_id * 1000 + i, "name": f"project-{i}",
+             "url": f"https://github.com/user{user_id}/project-{i}", "stars": i,
+             "languages": {"Python": 1000, "HTML": 100}}
+            for user_id in range(1, USERS + 1) for i in range(PROJECTS_PER_USER)
+        ])
+        await db.commit()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_until_up(base_url: str, server: subprocess.Popen):
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        for _ in range(100):
+            if server.poll() is not None:
+                raise RuntimeError("uvicorn exited during startup")
+            try:
+                if (await client.get("/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.1)
+    raise RuntimeError("uvicorn did not start")
+
+
+def pick_request(rng: random.Random, tokens):
+    """(label, path, params, headers) of a random request from the mix"""
+    user_id = rng.randint(1, USERS)
+    auth = {"Authorization": f"Bearer {tokens[user_id]}"}
+    roll = rng.random()
+    if roll < 0.4:
+        return "GET /portfolio/{username}", f"/portfolio/user{user_id}", {}, {}
+    if roll < 0.7:
+        return "GET /projects", "/projects", {"sort": "stars", "limit": 20}, auth
+    if roll < 0.9:
+        return "GET /users/me", "/users/me", {}, auth
+    return "GET /users/{username}", f"/users/user{user_id}", {}, {}
+
+
+async def client_loop(base_url: str, tokens, stop_at: float, seed: int, results):
+    rng = random.Random(seed)
+    async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+        while time.perf_counter() < stop_at:
+            label, path, params, headers = pick_request(rng, tokens)
+            started = time.perf_counter()
+            try:
+                ok = (await client.get(path, params=params, headers=headers)).status_code == 200
+            except httpx.TransportError:
+                ok = False
+            results[label].append((time.perf_counter() - started, ok))
+
+
+async def main():
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    await seed()
+    tokens = {i: create_access_token({"sub": str(i)}) for i in range(1, USERS + 1)}
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+         "--log-level", "warning", "--no-access-log"],
+        env=os.environ,
+    )
+    try:
+        await wait_until_up(base_url, server)
+        results = defaultdict(list)
+        started = time.perf_counter()
+        stop_at = started + DURATION
+        await asyncio.gather(*(
+            client_loop(base_url, tokens, stop_at, n, results) for n in range(CLIENTS)
+        ))
+        elapsed = time.perf_counter() - started
+    finally:
+        server.terminate()
+        server.wait()
+
+    total = sum(len(samples) for samples in results.values())
+    print(f"{CLIENTS} clients, {elapsed:.1f} s, {total / elapsed:.0f} requests/sec overall")
+    print(f"{'endpoint':<26} {'req/s':>7} {'p50 ms':>7} {'p95 ms':>7} {'errors':>7}")
+    for label, samples in sorted(results.items()):
+        times = [seconds * 1000 for seconds, _ in samples]
+        p95 = statistics.quantiles(times, n=20)[-1] if len(times) > 1 else times[0]
+        errors = sum(not ok for _, ok in samples)
+        print(f"{label:<26} {len(samples) / elapsed:>7.0f} {statistics.median(times):>7.1f} "
+              f"{p95:>7.1f} {errors:>7}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,99 @@
+"""
+Serializing a public portfolio payload of 10, 100 and 500 projects (two
+media items each): FastAPI's default path (jsonable_encoder then
+JSONResponse's json.dumps, as used before the typed response models)
+vs dumps_json with its stdlib fallback and with orjson.
+
+    python -m benchmarks.portfolio_serialization
+"""
+import asyncio
+import time
+from datetime import datetime
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import delete
+
+from app.api.portfolio import build_public_portfolio
+from app.core import responses
+from app.db.database import AsyncSessionLocal, Base, engine
+from app.db.migrations import run_migrations
+from app.models import Education, Experience, Media, Project, Skill, User
+
+PROJECT_COUNTS = (10, 100, 500)
+RUNS = 50
+
+
+async def seed(db, projects: int) -> str:
+    for table in reversed(Base.metadata.sorted_tables):
+        await db.execute(delete(table))
+    started = datetime(2020, 1, 1)
+    user = User(github_id=1, github_username="alice", portfolio_username="alice",
+                bio="Builds things for the web.", location="Berlin", created_at=started)
+    db.add(user)
+    await db.flush()
+    rows = [
+        Project(user_id=user.id, github_id=i, name=f"project-{i}",
+                description=f"Project number {i}, with a short description",
+                url=f"https://github.com/alice/project-{i}",
+                deployed_url=f"https://project-{i}.vercel.app", status="deployed",
+                languages={"Python": 4000 + i, "TypeScript": 1200, "HTML": 300},
+                stars=i % 50, forks=i % 7)
+        for i in range(projects)
+    ]
+    db.add_all(rows)
+    await db.flush()
+    db.add_all([
+        Experience(user_id=user.id, title="Engineer", company="Example", start_date=started),
+        Education(user_id=user.id, school="University", degree="BSc", start_date=started),
+        *(Skill(user_id=user.id, name=name) for name in ("Python", "React", "PostgreSQL")),
+        *(
+            Media(user_id=user.id, project_id=project.id, filename=f"shot-{n}.png",
+                  file_path=f"uploads/{project.id}/shot-{n}.png", media_type="screenshot",
+                  mime_type="image/png", title=f"Screenshot {n}", order=n)
+            for project in rows for n in range(2)
+        ),
+    ])
+    await db.commit()
+    return user.portfolio_username
+
+
+def per_call_ms(func) -> float:
+    started = time.perf_counter()
+    for _ in range(RUNS):
+        func()
+    return (time.perf_counter() - started) / RUNS * 1000
+
+
+def stdlib_dumps_json(content):
+    orjson, responses.orjson = responses.orjson, None
+    try:
+        return responses.dumps_json(content)
+    finally:
+        responses.orjson = orjson
+
+
+async def main():
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    default_response = JSONResponse(content=None)
+
+    print(f"mean of {RUNS} runs; orjson {'installed' if responses.orjson else 'NOT installed'}")
+    print(f"{'projects':>8} {'KB':>6} {'model_dump ms':>14} {'jsonable+json ms':>17} "
+          f"{'stdlib ms':>10} {'orjson ms':>10}")
+    for count in PROJECT_COUNTS:
+        async with AsyncSessionLocal() as db:
+            username = await seed(db, count)
+            portfolio = await build_public_portfolio(username, db)
+        data = portfolio.model_dump()
+
+        dump = per_call_ms(portfolio.model_dump)
+        default = per_call_ms(lambda: default_response.render(jsonable_encoder(data)))
+        stdlib = per_call_ms(lambda: stdlib_dumps_json(data))
+        fast = per_call_ms(lambda: responses.dumps_json(data)) if responses.orjson else float("nan")
+        size = len(responses.dumps_json(data)) / 1024
+        print(f"{count:>8} {size:>6.0f} {dump:>14.2f} {default:>17.2f} {stdlib:>10.2f} {fast:>10.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
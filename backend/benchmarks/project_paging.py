@@ -0,0 +1,100 @@
+"""
+Latency of GET /projects by page depth: OFFSET paging vs the keyset
+cursor, for each sort, on a user with 20,000 projects. An OFFSET page
+costs more the deeper it is; a cursor page should cost about the same
+at any depth.
+
+    python -m benchmarks.project_paging
+"""
+import asyncio
+import logging
+import statistics
+import time
+from datetime import datetime, timedelta
+
+import httpx
+from sqlalchemy import insert, select
+
+from app.api.projects import PROJECT_SORTS
+from app.core.pagination import encode_cursor
+from app.core.security import create_access_token
+from app.db.database import AsyncSessionLocal, Base, engine
+from app.db.migrations import run_migrations
+from app.main import app
+from app.models import Project, User
+
+PROJECT_COUNT = 20_000
+PAGE_SIZE = 20
+DEPTHS = (1, 10, 100, 500, 999)
+RUNS = 20
+
+
+async def seed() -> User:
+    async with AsyncSessionLocal() as db:
+        user = User(github_id=1, github_username="alice", portfolio_username="alice",
+                    access_token="gho_bench")
+        db.add(user)
+        await db.flush()
+        started = datetime(2020, 1, 1)
+        await db.execute(insert(Project), [
+            {
+                "user_id": user.id,
+                "github_id": i,
+                "name": f"project-{i % 5000:05d}",
+                "url": f"https://github.com/alice/project-{i}",
+                "stars": i % 200,
+                "updated_at": started + timedelta(hours=i % 10_000),
+            }
+            for i in range(PROJECT_COUNT)
+        ])
+        await db.commit()
+        return user
+
+
+async def cursor_for_page(user_id: int, sort: str, page: int) -> str:
+    """The cursor a client would hold after reading `page` pages"""
+    column, descending = PROJECT_SORTS[sort]
+    order = (column.desc(), Project.id.desc()) if descending else (column.asc(), Project.id.asc())
+    async with AsyncSessionLocal() as db:
+        last = await db.scalar(
+            select(Project).filter(Project.user_id == user_id)
+            .order_by(*order).offset(page * PAGE_SIZE - 1).limit(1)
+        )
+    return encode_cursor(sort, getattr(last, column.key), last.id)
+
+
+async def median_ms(client, params) -> float:
+    timings = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        response = await client.get("/projects", params=params)
+        timings.append(time.perf_counter() - started)
+        assert response.status_code == 200 and len(response.json()["items"]) == PAGE_SIZE
+    return statistics.median(timings) * 1000
+
+
+async def main():
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    user = await seed()
+    # app.main logs at INFO, and httpx logs every request at INFO
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test",
+                                 headers=headers) as client:
+        print(f"{PROJECT_COUNT} projects, {PAGE_SIZE} per page, median of {RUNS} requests")
+        print(f"{'sort':>8} {'page':>6} {'offset ms':>10} {'cursor ms':>10}")
+        for sort in PROJECT_SORTS:
+            for depth in DEPTHS:
+                base = {"sort": sort, "limit": PAGE_SIZE, "include_total": False}
+                offset = await median_ms(client, {**base, "skip": depth * PAGE_SIZE})
+                cursor = await median_ms(
+                    client, {**base, "cursor": await cursor_for_page(user.id, sort, depth)}
+                )
+                print(f"{sort:>8} {depth:>6} {offset:>10.2f} {cursor:>10.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,134 @@
+"""
+Mixed read/write load on SQLite under each SQLITE_PROFILES entry. Reader
+processes list a user's projects (like portfolio requests) while writer
+processes update projects, the way several server workers share one
+database file. Writes come in two shapes: one row per commit (progress
+updates, GitHub cache writes) and 100 rows per commit (a sync batch).
+Each profile gets its own file, since WAL mode sticks to the file.
+
+    python -m benchmarks.sqlite_profiles
+"""
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine, event, insert, select, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import NullPool
+
+from app.db.database import Base, SQLITE_PROFILES
+from app.models import Project, User
+
+READERS = 2
+WRITERS = 1
+DURATION = 5.0  # seconds per profile and write shape
+PROJECTS = 500
+WRITE_BATCHES = (1, 100)  # projects updated per write transaction
+
+
+def profile_engine(path: str, profile: str):
+    engine = create_engine(f"sqlite+pysqlite:///{path}", poolclass=NullPool)
+
+    @event.listens_for(engine, "connect")
+    def apply(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma, value in SQLITE_PROFILES[profile].items():
+            cursor.execute(f"PRAGMA {pragma}={value}")
+        cursor.close()
+
+    return engine
+
+
+def create_database(path: str, profile: str):
+    engine = profile_engine(path, profile)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(insert(User), [{
+            "id": 1, "github_id": 1, "github_username": "alice", "portfolio_username": "alice",
+        }])
+        connection.execute(insert(Project), [
+            {"user_id": 1, "github_id": i, "name": f"project-{i}",
+             "url": f"https://github.com/alice/project-{i}", "stars": 0}
+            for i in range(PROJECTS)
+        ])
+    engine.dispose()
+
+
+def reader(path: str, profile: str, batch_size: int, stop_at: float, results):
+    engine = profile_engine(path, profile)
+    times, errors = [], 0
+    query = select(Project.id, Project.name, Project.stars).filter(
+        Project.user_id == 1
+    ).order_by(Project.stars.desc())
+    while time.time() < stop_at:
+        started = time.perf_counter()
+        try:
+            with engine.connect() as connection:
+                connection.execute(query).all()
+            times.append(time.perf_counter() - started)
+        except OperationalError:  # database is locked
+            errors += 1
+    results.put(("read", times, errors))
+
+
+def writer(path: str, profile: str, batch_size: int, stop_at: float, results):
+    engine = profile_engine(path, profile)
+    times, errors, batch = [], 0, 0
+    while time.time() < stop_at:
+        started = time.perf_counter()
+        first = (batch * batch_size) % PROJECTS
+        try:
+            with engine.begin() as connection:
+                # One row at a time, as an ORM flush would
+                for github_id in range(first, first + batch_size):
+                    connection.execute(
+                        update(Project).filter(Project.github_id == github_id)
+                        .values(stars=Project.stars + 1)
+                    )
+            times.append(time.perf_counter() - started)
+        except OperationalError:
+            errors += 1
+        batch += 1
+    results.put(("write", times, errors))
+
+
+def run_profile(profile: str, path: str, batch_size: int):
+    results = multiprocessing.Queue()
+    stop_at = time.time() + DURATION
+    processes = [
+        multiprocessing.Process(target=target, args=(path, profile, batch_size, stop_at, results))
+        for target in [reader] * READERS + [writer] * WRITERS
+    ]
+    for process in processes:
+        process.start()
+    collected = {"read": ([], 0), "write": ([], 0)}
+    for _ in processes:
+        kind, times, errors = results.get()
+        collected[kind] = (collected[kind][0] + times, collected[kind][1] + errors)
+    for process in processes:
+        process.join()
+
+    def p95(times):
+        return statistics.quantiles(times, n=20)[-1] * 1000 if len(times) > 1 else float("nan")
+
+    (reads, read_errors), (writes, write_errors) = collected["read"], collected["write"]
+    print(f"{batch_size:>6} {profile:>10} {len(reads) / DURATION:>8.0f} {p95(reads):>9.1f} "
+          f"{len(writes) / DURATION:>9.1f} {p95(writes):>10.1f} {read_errors + write_errors:>7}")
+
+
+def main():
+    directory = tempfile.mkdtemp(prefix="onelink-bench-profiles-")
+    print(f"{READERS} reader and {WRITERS} writer processes, {DURATION:.0f} s per run, "
+          f"{PROJECTS} projects; latencies in ms")
+    print(f"{'batch':>6} {'profile':>10} {'reads/s':>8} {'read p95':>9} {'writes/s':>9} {'write p95':>10} {'errors':>7}")
+    for batch_size in WRITE_BATCHES:
+        for profile in SQLITE_PROFILES:
+            path = os.path.join(directory, f"{profile}-{batch_size}.db")
+            create_database(path, profile)
+            run_profile(profile, path, batch_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Wall-clock time of enriching repos (languages + README) against a fake
+GitHub with 20ms latency: one repo after another vs enrich_repos'
+bounded fan-out (GITHUB_SYNC_CONCURRENCY_PER_USER in flight).
+
+    python -m benchmarks.sync_enrichment
+"""
+import asyncio
+import time
+
+from benchmarks.fake_github import FakeGitHub
+from app.core.config import settings
+from app.services.github_cache import github_cache
+from app.services.github_service import github_service
+
+REPO_COUNTS = (10, 50, 100, 300)
+TOKEN = "gho_bench"
+
+
+async def serial(repos):
+    for repo in repos:
+        owner, name = repo["owner"]["login"], repo["name"]
+        await github_service.get_repo_languages(TOKEN, owner, name)
+        await github_service.get_readme_content(TOKEN, owner, name)
+
+
+async def main():
+    # Measure the requests themselves, not revalidation
+    github_cache.enabled = False
+    print(f"per-user concurrency: {settings.GITHUB_SYNC_CONCURRENCY_PER_USER}")
+    print(f"{'repos':>6} {'requests':>9} {'serial s':>9} {'fan-out s':>10} {'speedup':>8}")
+    for count in REPO_COUNTS:
+        fake = FakeGitHub(count)
+        fake.install()
+
+        started = time.perf_counter()
+        await serial(fake.repos)
+        serial_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        await github_service.enrich_repos(TOKEN, fake.repos)
+        fan_out_time = time.perf_counter() - started
+
+        print(
+            f"{count:>6} {2 * count:>9} {serial_time:>9.2f} {fan_out_time:>10.2f} "
+            f"{serial_time / fan_out_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,89 @@
+"""
+Write phase of a sync: per-repo lookup + commit (how syncs used to write)
+vs the single-transaction bulk upsert in sync_user_projects, for growing
+repo counts. Both write the same rows into an emptied projects table;
+GitHub is an in-process fake with no latency so the writes dominate.
+
+    python -m benchmarks.sync_writes
+"""
+import asyncio
+import time
+from datetime import datetime
+
+from sqlalchemy import delete, select
+
+from benchmarks.fake_github import FakeGitHub
+from app.core.config import settings
+from app.db.database import AsyncSessionLocal, Base, engine
+from app.db.migrations import run_migrations
+from app.models import Project, User
+from app.services.github_cache import github_cache
+from app.services.github_service import github_service
+from app.services.project_sync import sync_user_projects
+
+REPO_COUNTS = (10, 100, 500, 1000)
+
+
+async def per_repo_writes(user_id: int, repos):
+    """One SELECT and one COMMIT per repo"""
+    async with AsyncSessionLocal() as db:
+        for repo in repos:
+            project = await db.scalar(select(Project).filter(
+                Project.user_id == user_id, Project.github_id == repo["id"]
+            ))
+            if project is None:
+                project = Project(user_id=user_id, github_id=repo["id"])
+                db.add(project)
+            project.name = repo["name"]
+            project.description = repo["description"]
+            project.url = repo["html_url"]
+            project.homepage = repo["homepage"]
+            project.readme_content = repo["enrichment"]["readme"]
+            project.languages = repo["enrichment"]["languages"]
+            project.stars = repo["stargazers_count"]
+            project.github_updated_at = github_service.get_repo_updated_at(repo)
+            project.updated_at = datetime.utcnow()
+            await db.commit()
+
+
+async def clear_projects():
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(Project))
+        await db.commit()
+
+
+async def main():
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    github_cache.enabled = False
+    # One request per 100 repos, so the fetch costs next to nothing
+    settings.GITHUB_FETCH_MODE = "graphql"
+    settings.GITHUB_GRAPHQL_PAGE_SIZE = 100
+
+    async with AsyncSessionLocal() as db:
+        user = User(github_id=1, github_username="alice", portfolio_username="alice",
+                    access_token="gho_bench")
+        db.add(user)
+        await db.commit()
+
+        print(f"{'repos':>6} {'per-repo s':>11} {'bulk upsert s':>14} {'speedup':>8}")
+        for count in REPO_COUNTS:
+            fake = FakeGitHub(count, latency=0)
+            fake.install()
+            repos = await github_service.get_user_repos_graphql(user.access_token, "alice")
+
+            await clear_projects()
+            started = time.perf_counter()
+            await per_repo_writes(user.id, repos)
+            per_repo = time.perf_counter() - started
+
+            await clear_projects()
+            started = time.perf_counter()
+            await sync_user_projects(user, db, full=True)
+            bulk = time.perf_counter() - started
+
+            print(f"{count:>6} {per_repo:>11.3f} {bulk:>14.3f} {per_repo / bulk:>7.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
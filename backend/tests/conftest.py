@@ -0,0 +1,153 @@
+import os
+import tempfile
+
+# Settings and the database engines are created when app is first
+# imported, so the test environment is set up before that. Point
+# TEST_DATABASE_URL at a scratch database to run the suite against another
+# backend (e.g. PostgreSQL); by default it uses a temporary SQLite file.
+_tmp_dir = tempfile.mkdtemp(prefix="onelink-tests-")
+os.environ.setdefault("GITHUB_CLIENT_ID", "test-client-id")
+os.environ.setdefault("GITHUB_CLIENT_SECRET", "test-client-secret")
+os.environ["DATABASE_URL"] = (
+    os.environ.get("TEST_DATABASE_URL") or f"sqlite:///{_tmp_dir}/test.db"
+)
+os.environ["UPLOAD_DIR"] = os.path.join(_tmp_dir, "uploads")
+
+import asyncio  # noqa: E402
+from datetime import datetime  # noqa: E402
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+
+from sqlalchemy import delete, event  # noqa: E402
+
+import app.models  # noqa: E402,F401  (registers every table)
+from app.core.config import settings  # noqa: E402
+from app.core.token_cache import token_cache  # noqa: E402
+from app.db.database import AsyncSessionLocal, Base, async_engine, engine  # noqa: E402
+from app.db.migrations import run_migrations  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import Education, Experience, Media, Project, Skill, User  # noqa: E402
+from app.services.github_rate_limiter import GitHubRateLimiter  # noqa: E402
+from app.services.github_service import github_service  # noqa: E402
+from app.services.portfolio_cache import portfolio_cache  # noqa: E402
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+def schema():
+    """Create the schema once, as application startup does"""
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+
+
+@pytest.fixture
+async def db(schema):
+    """A session on an emptied database; in-process caches are cleared too"""
+    async with AsyncSessionLocal() as session:
+        for table in reversed(Base.metadata.sorted_tables):
+            await session.execute(delete(table))
+        await session.commit()
+    portfolio_cache._entries.clear()
+    token_cache._entries.clear()
+    token_cache._tokens_by_user.clear()
+
+    async with AsyncSessionLocal() as session:
+        yield session
+    # Pooled connections belong to this test's event loop
+    await async_engine.dispose()
+
+
+@pytest.fixture
+def make_user(db):
+    """
+    Factory adding a user to the database with `projects` projects and,
+    with details=True, an experience, education, skill and media item for
+    the portfolio plus one media item per project.
+    """
+    async def make(
+        username: str = "alice", projects: int = 0, details: bool = False, **fields
+    ) -> User:
+        user = User(
+            github_id=fields.pop("github_id", abs(hash(username)) % 10 ** 9),
+            github_username=username,
+            portfolio_username=username,
+            access_token=fields.pop("access_token", "gho_test"),
+            **fields,
+        )
+        db.add(user)
+        await db.flush()
+        project_rows = [
+            Project(
+                user_id=user.id,
+                github_id=1000 + i,
+                name=f"project-{i}",
+                url=f"https://github.com/{username}/project-{i}",
+                languages={"Python": 100},
+            )
+            for i in range(projects)
+        ]
+        db.add_all(project_rows)
+        if details:
+            await db.flush()
+            started = datetime(2020, 1, 1)
+            db.add_all([
+                Experience(user_id=user.id, title="Engineer", company="Example", start_date=started),
+                Education(user_id=user.id, school="University", degree="BSc", start_date=started),
+                Skill(user_id=user.id, name="Python"),
+                Media(user_id=user.id, filename="me.png", file_path="uploads/me.png",
+                      media_type="screenshot"),
+                *(
+                    Media(user_id=user.id, project_id=project.id, filename="shot.png",
+                          file_path="uploads/shot.png", media_type="screenshot")
+                    for project in project_rows
+                ),
+            ])
+        await db.commit()
+        return user
+
+    return make
+
+
+@pytest.fixture
+def queries():
+    """(statement, parameters) of every query the async engine runs, in order"""
+    recorded = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        recorded.append((statement, parameters))
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    yield recorded
+    event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+async def client(db):
+    """HTTP client for the app, without running its startup hooks"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+        yield http
+
+
+@pytest.fixture
+def mock_github(monkeypatch):
+    """
+    Route github_service through an httpx.MockTransport. Call the fixture
+    with a handler(request) -> httpx.Response; each test gets a fresh
+    rate limiter and global limit.
+    """
+    def install(handler):
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(github_service, "_client", client)
+        return client
+
+    monkeypatch.setattr(github_service, "rate_limiter", GitHubRateLimiter())
+    monkeypatch.setattr(
+        github_service, "_global_limit", asyncio.Semaphore(settings.GITHUB_MAX_CONCURRENCY)
+    )
+    return install
@@ -0,0 +1,22 @@
+import pytest
+from sqlalchemy.engine import make_url
+
+from app.db.database import _with_driver
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("sqlite:///./app.db", "sqlite+aiosqlite"),
+    ("postgresql://user:secret@db/app", "postgresql+asyncpg"),
+    ("postgresql+psycopg2://user:secret@db/app", "postgresql+asyncpg"),
+])
+def test_urls_get_the_backends_async_driver(url, expected):
+    assert _with_driver(make_url(url), is_async=True).drivername == expected
+
+
+@pytest.mark.parametrize("url", [
+    "postgres://user:secret@db/app",
+    "mysql://user:secret@db/app",
+])
+def test_unsupported_backends_are_a_clear_error(url):
+    with pytest.raises(ValueError, match="supported backends: sqlite, postgresql"):
+        _with_driver(make_url(url), is_async=False)
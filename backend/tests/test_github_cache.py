@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, update
+
+from app.models import GitHubCacheEntry
+from app.services.github_cache import GitHubResponseCache
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def cache(db):
+    cache = GitHubResponseCache()
+    cache.enabled = True
+    cache.touch_interval = 3600
+    return cache
+
+
+async def last_used(db, key: str) -> datetime:
+    db.expire_all()
+    return await db.scalar(select(GitHubCacheEntry.last_used).filter(GitHubCacheEntry.key == key))
+
+
+async def age(db, key: str, seconds: int):
+    await db.execute(
+        update(GitHubCacheEntry)
+        .filter(GitHubCacheEntry.key == key)
+        .values(last_used=datetime.utcnow() - timedelta(seconds=seconds))
+    )
+    await db.commit()
+
+
+async def test_recent_hits_do_not_write(db, cache, queries):
+    await cache.store("key", "https://api.github.com/x", '{"a": 1}', '"etag"', None)
+    queries.clear()
+
+    for _ in range(3):
+        assert (await cache.get("key"))["etag"] == '"etag"'
+
+    assert [s for s, _ in queries if not s.lstrip().upper().startswith("SELECT")] == []
+
+
+async def test_stale_hit_bumps_last_used(db, cache, queries):
+    await cache.store("key", "https://api.github.com/x", '{"a": 1}', '"etag"', None)
+    await age(db, "key", 7200)
+    before = await last_used(db, "key")
+    queries.clear()
+
+    assert (await cache.get("key"))["body"] == '{"a": 1}'
+
+    assert sum(s.lstrip().upper().startswith("UPDATE") for s, _ in queries) == 1
+    assert await last_used(db, "key") > before + timedelta(seconds=7000)
+
+
+async def test_eviction_keeps_recently_hit_entries(db, cache):
+    for key in ("old", "new"):
+        await cache.store(key, f"https://api.github.com/{key}", "x" * 100, '"etag"', None)
+    await age(db, "old", 7200)
+    await age(db, "new", 5400)
+    await cache.get("old")
+
+    cache.max_bytes = 150
+    await cache.evict()
+
+    keys = (await db.scalars(select(GitHubCacheEntry.key))).all()
+    assert keys == ["old"]
@@ -0,0 +1,177 @@
+import base64
+import json
+
+import httpx
+import pytest
+from sqlalchemy import delete, select
+
+from app.core.config import settings
+from app.models import Project
+from app.services.github_cache import github_cache
+from app.services.github_service import README_ALIASES, github_service
+from app.services.project_sync import sync_user_projects
+
+pytestmark = pytest.mark.anyio
+
+# Repos of one user and the README file each one has, if any
+REPOS = [
+    ("api", "README.md"),
+    ("site", "Readme.md"),
+    ("docs", "README.rst"),
+    ("tool", "README"),
+    ("scratch", None),
+]
+
+
+def repo(i: int, name: str, **fields):
+    return {
+        "id": 500 + i,
+        "name": name,
+        "owner": {"login": "alice"},
+        "description": f"{name} description",
+        "html_url": f"https://github.com/alice/{name}",
+        "homepage": "https://api.example.dev" if name == "api" else None,
+        "stargazers_count": i * 3,
+        "forks_count": i,
+        "watchers_count": i * 3,
+        "archived": False,
+        "fork": False,
+        "pushed_at": f"2024-05-0{i + 1}T10:00:00Z",
+        "updated_at": f"2024-05-0{i + 1}T10:00:00Z",
+        **fields,
+    }
+
+
+class FakeGitHubAPI:
+    """One user's repositories over both REST and GraphQL"""
+
+    def __init__(self):
+        self.repos = [repo(i, name) for i, (name, _) in enumerate(REPOS)]
+        self.readme_files = {name: path for name, path in REPOS}
+        self.graphql_cursors = []
+        self.graphql_errors = None
+
+    def readme(self, name: str) -> str:
+        return f"# {name}\n\nLive demo: https://{name}.vercel.app"
+
+    def languages(self, name: str):
+        return {"Python": 1000 + len(name), "Shell": 10}
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/graphql":
+            return httpx.Response(200, json=self.graphql(json.loads(request.content)))
+        if path == "/users/alice/repos":
+            page = int(request.url.params.get("page", 1))
+            per_page = int(request.url.params.get("per_page", 30))
+            return httpx.Response(200, json=self.repos[(page - 1) * per_page:page * per_page])
+        name = path.split("/")[3]
+        if path.endswith("/languages"):
+            return httpx.Response(200, json=self.languages(name))
+        if self.readme_files[name] is None:
+            return httpx.Response(404, json={"message": "Not Found"})
+        content = base64.b64encode(self.readme(name).encode()).decode()
+        return httpx.Response(200, json={"content": content})
+
+    def graphql(self, body):
+        if self.graphql_errors:
+            return {"data": {"user": None}, "errors": self.graphql_errors}
+        variables = body["variables"]
+        self.graphql_cursors.append(variables["cursor"])
+        start = int(variables["cursor"] or 0)
+        page = self.repos[start:start + variables["pageSize"]]
+        end = start + len(page)
+        return {"data": {"user": {"repositories": {
+            "pageInfo": {"hasNextPage": end < len(self.repos), "endCursor": str(end)},
+            "nodes": [self.node(r) for r in page],
+        }}}}
+
+    def node(self, r):
+        readme_path = self.readme_files[r["name"]]
+        return {
+            "databaseId": r["id"],
+            "name": r["name"],
+            "owner": r["owner"],
+            "description": r["description"],
+            "url": r["html_url"],
+            "homepageUrl": r["homepage"],
+            "stargazerCount": r["stargazers_count"],
+            "forkCount": r["forks_count"],
+            "watchers": {"totalCount": r["watchers_count"]},
+            "isArchived": r["archived"],
+            "isFork": r["fork"],
+            "pushedAt": r["pushed_at"],
+            "updatedAt": r["updated_at"],
+            "languages": {"edges": [
+                {"size": size, "node": {"name": language}}
+                for language, size in self.languages(r["name"]).items()
+            ]},
+            **{
+                alias: {"text": self.readme(r["name"])} if path == readme_path else None
+                for alias, path in README_ALIASES.items()
+            },
+        }
+
+
+@pytest.fixture
+def github(mock_github, monkeypatch):
+    monkeypatch.setattr(github_cache, "enabled", False)
+    api = FakeGitHubAPI()
+    mock_github(api)
+    return api
+
+
+async def stored_projects(db):
+    projects = (await db.scalars(select(Project).order_by(Project.github_id))).all()
+    columns = [
+        "github_id", "name", "description", "url", "homepage", "deployed_url",
+        "status", "languages", "stars", "github_updated_at",
+    ]
+    return [{column: getattr(p, column) for column in columns} for p in projects]
+
+
+async def test_graphql_and_rest_store_identical_projects(db, make_user, github, monkeypatch):
+    user = await make_user("alice")
+
+    monkeypatch.setattr(settings, "GITHUB_FETCH_MODE", "rest")
+    assert await sync_user_projects(user, db) == len(REPOS)
+    rest_rows = await stored_projects(db)
+    await db.execute(delete(Project))
+    await db.commit()
+
+    monkeypatch.setattr(settings, "GITHUB_FETCH_MODE", "graphql")
+    assert await sync_user_projects(user, db) == len(REPOS)
+    graphql_rows = await stored_projects(db)
+
+    assert graphql_rows == rest_rows
+    # Every README was found, whichever of the names it had
+    assert [row["deployed_url"] is not None for row in graphql_rows] == [
+        path is not None for _, path in REPOS
+    ]
+
+
+async def test_graphql_follows_end_cursor_across_pages(github, monkeypatch):
+    monkeypatch.setattr(settings, "GITHUB_GRAPHQL_PAGE_SIZE", 2)
+
+    repos = await github_service.get_user_repos_graphql("gho_test", "alice")
+
+    assert [r["name"] for r in repos] == [name for name, _ in REPOS]
+    assert github.graphql_cursors == [None, "2", "4"]
+
+
+async def test_graphql_errors_raise(github):
+    github.graphql_errors = [{"type": "NOT_FOUND", "message": "Could not resolve to a User"}]
+
+    with pytest.raises(ValueError, match="Could not resolve"):
+        await github_service.get_user_repos_graphql("gho_test", "alice")
+
+
+async def test_graphql_skips_archived_repos_like_rest(github):
+    github.repos[1]["archived"] = True
+
+    repos = await github_service.get_user_repos_graphql("gho_test", "alice")
+
+    assert "site" not in [r["name"] for r in repos]
+    assert [r["name"] for r in repos] == [
+        r["name"] for r in await github_service.get_user_repos("gho_test", "alice")
+    ]
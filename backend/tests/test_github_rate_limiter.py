@@ -0,0 +1,114 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.services import github_rate_limiter as limiter_module
+from app.services.github_cache import github_cache
+from app.services.github_rate_limiter import BULK, GitHubRateLimiter, GitHubRateLimitError
+from app.services.github_service import github_service
+
+pytestmark = pytest.mark.anyio
+
+TOKEN = "gho_test"
+
+
+class FakeGitHub:
+    """REST handler answering like GitHub does on a fresh rate limit window"""
+
+    def __init__(self, limit: int = 5000, remaining: int = None, reset_in: float = 3600):
+        self.limit = limit
+        self.remaining = limit if remaining is None else remaining
+        self.reset_at = int(time.time() + reset_in)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def headers(self):
+        return {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Used": str(self.limit - self.remaining),
+            "X-RateLimit-Reset": str(self.reset_at),
+            "X-RateLimit-Resource": "core",
+        }
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.001)
+            self.remaining -= 1
+            if request.url.path.endswith("/languages"):
+                return httpx.Response(200, json={"Python": 1000}, headers=self.headers())
+            return httpx.Response(
+                200, json={"content": "IyBSZWFkbWU="}, headers=self.headers()
+            )
+        finally:
+            self.in_flight -= 1
+
+
+def make_repos(count: int):
+    return [{"name": f"repo-{i}", "owner": {"login": "alice"}} for i in range(count)]
+
+
+@pytest.fixture(autouse=True)
+def no_response_cache(monkeypatch):
+    # These tests are about scheduling, not revalidation
+    monkeypatch.setattr(github_cache, "enabled", False)
+
+
+async def test_fresh_budget_sync_is_not_throttled(mock_github):
+    fake = FakeGitHub()
+    mock_github(fake)
+
+    started = time.monotonic()
+    results = await github_service.enrich_repos(TOKEN, make_repos(300))
+
+    assert len(results) == 300
+    assert fake.limit - fake.remaining == 600
+    stats = github_service.rate_limiter.get_stats()
+    assert stats["waits"] == 0
+    assert stats["wait_seconds"] == 0
+    assert time.monotonic() - started < 10
+
+
+async def test_sync_requests_are_bounded_per_user(mock_github):
+    fake = FakeGitHub()
+    mock_github(fake)
+
+    await github_service.enrich_repos(TOKEN, make_repos(50))
+
+    assert 1 < fake.max_in_flight <= settings.GITHUB_SYNC_CONCURRENCY_PER_USER
+
+
+async def test_bulk_requests_are_paced_below_low_water(monkeypatch):
+    limiter = GitHubRateLimiter()
+    delays = []
+
+    async def sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(limiter_module, "asyncio", SimpleNamespace(sleep=sleep))
+    fake = FakeGitHub(remaining=settings.GITHUB_RATE_LIMIT_RESERVE + 100, reset_in=300)
+    limiter.update(TOKEN, httpx.Response(200, headers=fake.headers()))
+
+    for _ in range(3):
+        await limiter.wait(TOKEN, BULK)
+
+    # 100 spendable requests over 300 seconds: one every ~3 seconds
+    assert len(delays) == 2
+    assert delays[0] == pytest.approx(3, abs=0.1)
+    assert delays[1] == pytest.approx(6, abs=0.1)
+
+
+async def test_spent_budget_fails_instead_of_stalling():
+    limiter = GitHubRateLimiter()
+    fake = FakeGitHub(remaining=settings.GITHUB_RATE_LIMIT_RESERVE, reset_in=1800)
+    limiter.update(TOKEN, httpx.Response(200, headers=fake.headers()))
+
+    with pytest.raises(GitHubRateLimitError):
+        await limiter.wait(TOKEN, BULK)
+    assert limiter.stats["rejected"] == 1
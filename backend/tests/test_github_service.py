@@ -0,0 +1,94 @@
+import asyncio
+import base64
+import time
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.services.github_cache import github_cache
+from app.services.github_rate_limiter import GitHubRateLimitError
+from app.services.github_service import github_service
+
+pytestmark = pytest.mark.anyio
+
+
+class SlowGitHub:
+    """Languages and README for any repo, after a fixed latency"""
+
+    def __init__(self, latency: float = 0.02):
+        self.latency = latency
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+        owner, name = request.url.path.split("/")[2:4]
+        if request.url.path.endswith("/languages"):
+            return httpx.Response(200, json={name: 100})
+        readme = base64.b64encode(f"# {owner}/{name}".encode()).decode()
+        return httpx.Response(200, json={"content": readme})
+
+
+def make_repos(count: int, owner: str = "alice"):
+    return [{"name": f"repo-{i}", "owner": {"login": owner}} for i in range(count)]
+
+
+@pytest.fixture(autouse=True)
+def no_response_cache(monkeypatch):
+    monkeypatch.setattr(github_cache, "enabled", False)
+
+
+async def test_enrichment_fans_out_and_keeps_repo_order(mock_github):
+    fake = SlowGitHub(latency=0.02)
+    mock_github(fake)
+
+    started = time.monotonic()
+    results = await github_service.enrich_repos("gho_test", make_repos(100))
+    elapsed = time.monotonic() - started
+
+    assert results == [
+        {"languages": {f"repo-{i}": 100}, "readme": f"# alice/repo-{i}"} for i in range(100)
+    ]
+    # 200 requests one after another would take 4s
+    assert elapsed < 2
+    assert fake.max_in_flight == settings.GITHUB_SYNC_CONCURRENCY_PER_USER
+
+
+async def test_concurrent_syncs_share_the_global_limit(mock_github, monkeypatch):
+    fake = SlowGitHub()
+    mock_github(fake)
+    monkeypatch.setattr(github_service, "_global_limit", asyncio.Semaphore(10))
+
+    await asyncio.gather(*(
+        github_service.enrich_repos(f"gho_{owner}", make_repos(20, owner))
+        for owner in ("alice", "bob", "carol")
+    ))
+
+    assert fake.requests == 3 * 40
+    assert fake.max_in_flight == 10
+
+
+async def test_rate_limit_failure_stops_the_sync(mock_github, monkeypatch):
+    monkeypatch.setattr(settings, "GITHUB_MAX_RETRIES", 0)
+    fake = SlowGitHub()
+
+    async def handler(request):
+        if request.url.path == "/repos/alice/repo-3/readme":
+            return httpx.Response(403, headers={"X-RateLimit-Remaining": "0"})
+        return await fake(request)
+
+    mock_github(handler)
+
+    with pytest.raises(GitHubRateLimitError):
+        await github_service.enrich_repos("gho_test", make_repos(200))
+    # The remaining repos were cancelled rather than fetched
+    await asyncio.sleep(0.1)
+    assert fake.requests < 100
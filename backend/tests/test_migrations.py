@@ -0,0 +1,104 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import inspect, text
+
+import app.main
+from app.db.database import engine
+from app.db.migrations import MIGRATIONS, compress_column, run_migrations
+from app.db.types import decompress_text, is_compressed
+
+pytestmark = pytest.mark.anyio
+
+
+def insert(connection, table: str, **values):
+    columns = ", ".join(values)
+    params = ", ".join(f":{name}" for name in values)
+    connection.execute(text(f"INSERT INTO {table} ({columns}) VALUES ({params})"), values)
+
+
+async def test_duplicate_projects_are_merged_before_the_unique_index(db):
+    now = datetime.utcnow()
+    # A database from before migration 2: no unique index, one repo
+    # synced twice, with media attached to the older row
+    with engine.begin() as connection:
+        connection.execute(text("DROP INDEX uq_projects_user_github"))
+        connection.execute(text("DELETE FROM schema_migrations WHERE version >= 2"))
+        insert(connection, "users", id=1, github_id=1, github_username="alice",
+               portfolio_username="alice", content_version=1, is_public=True)
+        for project_id, github_id in ((1, 7), (2, 7), (3, 8)):
+            insert(connection, "projects", id=project_id, user_id=1, github_id=github_id,
+                   name=f"repo-{github_id}", url="https://github.com/alice", created_at=now)
+        insert(connection, "media", id=1, user_id=1, project_id=1, filename="shot.png",
+               file_path="uploads/shot.png", media_type="screenshot")
+
+    applied = run_migrations(engine)
+
+    assert applied == [version for version, _, _ in MIGRATIONS if version >= 2]
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT id FROM projects ORDER BY id")).scalars().all() == [2, 3]
+        assert connection.execute(text("SELECT project_id FROM media")).scalar() == 2
+        indexes = {index["name"] for index in inspect(connection).get_indexes("projects")}
+    assert "uq_projects_user_github" in indexes
+
+
+async def test_startup_fails_when_a_migration_fails(schema, monkeypatch):
+    def broken(engine):
+        raise RuntimeError("migration 2 failed")
+
+    monkeypatch.setattr(app.main, "run_migrations", broken)
+
+    with pytest.raises(RuntimeError, match="migration 2 failed"):
+        await app.main.startup()
+
+
+async def test_plain_text_readmes_are_compressed_in_place(db, make_user):
+    await make_user("alice", projects=2)
+    readme = "# Project\n" + "Some README text. " * 100
+    with engine.begin() as connection:
+        # As written before the column was compressed
+        connection.execute(text("UPDATE projects SET readme_content = :readme"), {"readme": readme})
+        compress_column(connection, "projects", "readme_content")
+        # Running it again leaves compressed rows alone
+        compress_column(connection, "projects", "readme_content")
+
+    with engine.connect() as connection:
+        values = connection.execute(text("SELECT readme_content FROM projects")).scalars().all()
+    assert len(values) == 2
+    assert all(is_compressed(value) and decompress_text(value) == readme for value in values)
+
+
+@pytest.mark.skipif(engine.dialect.name != "postgresql", reason="PostgreSQL column types")
+async def test_compress_column_only_converts_text_columns(db):
+    with engine.begin() as connection:
+        # Created from the current models: already BYTEA, nothing to convert
+        compress_column(connection, "projects", "readme_content")
+
+        connection.execute(text("CREATE TEMPORARY TABLE legacy (id INTEGER PRIMARY KEY, readme_content TEXT)"))
+        compress_column(connection, "legacy", "readme_content")
+        column_type = connection.execute(text(
+            "SELECT data_type FROM information_schema.columns "
+            "WHERE table_name = 'legacy' AND column_name = 'readme_content'"
+        )).scalar()
+    assert column_type == "bytea"
+
+
+async def test_duplicate_active_sync_jobs_are_closed_before_the_unique_index(db):
+    now = datetime.utcnow()
+    # A database from before migration 6: one user with two queued jobs
+    with engine.begin() as connection:
+        connection.execute(text("DROP INDEX uq_sync_jobs_active_user"))
+        connection.execute(text("DELETE FROM schema_migrations WHERE version >= 6"))
+        insert(connection, "users", id=1, github_id=1, github_username="alice",
+               portfolio_username="alice", content_version=1, is_public=True)
+        for job_id, status in ((1, "completed"), (2, "queued"), (3, "queued")):
+            insert(connection, "sync_jobs", id=job_id, user_id=1, status=status,
+                   errors="[]", created_at=now)
+
+    assert run_migrations(engine) == [6]
+
+    with engine.connect() as connection:
+        statuses = connection.execute(text("SELECT status FROM sync_jobs ORDER BY id")).scalars().all()
+        indexes = {index["name"] for index in inspect(connection).get_indexes("sync_jobs")}
+    assert statuses == ["completed", "queued", "failed"]
+    assert "uq_sync_jobs_active_user" in indexes
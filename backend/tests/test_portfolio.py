@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select
+
+from app.models import PortfolioSnapshot
+from app.services.portfolio_cache import bump_content_version, portfolio_cache
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_portfolio_is_served_and_revalidated(client, make_user):
+    await make_user("alice", projects=3)
+
+    response = await client.get("/portfolio/alice")
+    assert response.status_code == 200
+    assert [p["name"] for p in response.json()["projects"]] == [
+        "project-0", "project-1", "project-2",
+    ]
+
+    etag = response.headers["etag"]
+    revalidated = await client.get("/portfolio/alice", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+
+
+async def test_portfolio_query_count_does_not_grow_with_projects(client, make_user, queries):
+    await make_user("alice", projects=1, details=True)
+    await make_user("bob", projects=50, details=True)
+
+    counts = {}
+    for username in ("alice", "bob"):
+        queries.clear()
+        response = await client.get(f"/portfolio/{username}")
+        assert response.status_code == 200
+        counts[username] = sum(statement.lstrip().upper().startswith("SELECT") for statement, _ in queries)
+
+    assert len((await client.get("/portfolio/bob")).json()["projects"]) == 50
+    # owner + snapshot lookup + user + one per collection
+    assert counts["alice"] == counts["bob"] == 9
+
+
+async def test_concurrent_misses_after_a_version_bump(client, db, make_user):
+    # More concurrent misses than the connection pool has connections
+    # (5 + 10 overflow): each request must get by with its own session
+    user = await make_user("alice", projects=5)
+    assert (await client.get("/portfolio/alice")).status_code == 200
+
+    await bump_content_version(db, user.id)
+    await db.commit()
+    portfolio_cache._entries.clear()
+
+    responses = await asyncio.wait_for(
+        asyncio.gather(*(client.get("/portfolio/alice") for _ in range(60))),
+        timeout=20,
+    )
+
+    assert [r.status_code for r in responses] == [200] * 60
+    assert len({r.content for r in responses}) == 1
+    snapshot = await db.scalar(select(PortfolioSnapshot))
+    assert snapshot.content_version == 2
+
+
+async def test_cold_worker_serves_the_persisted_snapshot(client, make_user):
+    await make_user("alice", projects=2)
+    first = await client.get("/portfolio/alice")
+
+    # As if another worker had built it
+    portfolio_cache._entries.clear()
+    hits = portfolio_cache.persistent_hits
+    second = await client.get("/portfolio/alice")
+
+    assert second.content == first.content
+    assert portfolio_cache.persistent_hits == hits + 1
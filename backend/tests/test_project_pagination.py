@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app.core.pagination import encode_cursor
+from app.core.security import create_access_token
+from app.models import Project
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def user_with_ties(db, make_user):
+    """A user whose 23 projects share sort keys in small groups"""
+    user = await make_user("alice", projects=23)
+    projects = (await db.scalars(select(Project).filter(Project.user_id == user.id))).all()
+    started = datetime(2024, 1, 1)
+    for i, project in enumerate(projects):
+        project.stars = i % 3
+        project.name = f"project-{i % 4}"
+        project.updated_at = started + timedelta(days=i % 5)
+    await db.commit()
+    return user
+
+
+def headers_for(user):
+    return {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+
+
+async def walk(client, headers, sort: str, limit: int = 4):
+    """Every page of the project list for a sort, following next_cursor"""
+    pages = []
+    params = {"sort": sort, "limit": limit}
+    while True:
+        response = await client.get("/projects", headers=headers, params=params)
+        assert response.status_code == 200
+        body = response.json()
+        pages.append(body["items"])
+        if body["next_cursor"] is None:
+            return pages
+        params["cursor"] = body["next_cursor"]
+
+
+@pytest.mark.parametrize("sort, key, descending", [
+    ("updated", "updated_at", True),
+    ("stars", "stars", True),
+    ("name", "name", False),
+])
+async def test_cursor_paging_returns_every_row_once_in_order(
+    client, user_with_ties, sort, key, descending
+):
+    pages = await walk(client, headers_for(user_with_ties), sort)
+
+    rows = [row for page in pages for row in page]
+    assert len(pages) == 6
+    assert len(rows) == 23
+    assert len({row["id"] for row in rows}) == 23
+    # Ties on the sort key are broken by id in the same direction
+    order = [(row[key], row["id"]) for row in rows]
+    assert order == sorted(order, reverse=descending)
+
+
+async def test_cursor_from_another_sort_is_rejected(client, user_with_ties):
+    headers = headers_for(user_with_ties)
+    response = await client.get("/projects", headers=headers, params={"sort": "stars", "limit": 4})
+    cursor = response.json()["next_cursor"]
+
+    response = await client.get(
+        "/projects", headers=headers, params={"sort": "name", "cursor": cursor}
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("sort, key", [
+    ("name", []),
+    ("name", 3),
+    ("updated", "x"),
+    ("updated", 3),
+    ("stars", "3"),
+    ("stars", True),
+    ("stars", None),
+    ("unknown", 3),
+])
+async def test_cursor_with_the_wrong_key_type_is_rejected(client, user_with_ties, sort, key):
+    params = {"sort": sort if sort != "unknown" else "stars", "cursor": encode_cursor(sort, key, 1)}
+
+    response = await client.get("/projects", headers=headers_for(user_with_ties), params=params)
+    assert response.status_code == 400
+
+
+async def test_garbage_cursor_is_rejected(client, user_with_ties):
+    response = await client.get(
+        "/projects", headers=headers_for(user_with_ties), params={"cursor": "not-a-cursor"}
+    )
+    assert response.status_code == 400
@@ -0,0 +1,186 @@
+import base64
+
+import httpx
+import pytest
+from sqlalchemy import event, func, select, update
+
+from app.db.database import async_engine
+from app.models import Project, SyncJob
+from app.services.github_cache import github_cache
+from app.services.project_sync import sync_user_projects
+from app.services.sync_jobs import sync_job_queue
+
+pytestmark = pytest.mark.anyio
+
+
+def rest_repo(repo_id: int, name: str, updated_at: str = "2024-05-01T10:00:00Z"):
+    return {
+        "id": repo_id,
+        "name": name,
+        "owner": {"login": "alice"},
+        "description": f"{name} description",
+        "html_url": f"https://github.com/alice/{name}",
+        "homepage": None,
+        "stargazers_count": 3,
+        "forks_count": 1,
+        "watchers_count": 3,
+        "archived": False,
+        "fork": False,
+        "pushed_at": updated_at,
+        "updated_at": updated_at,
+    }
+
+
+class FakeRestAPI:
+    """Minimal GitHub REST API for one user's repositories"""
+
+    def __init__(self, repos):
+        self.repos = repos
+        self.checked_out = []
+        # Repo names whose README requests fail
+        self.broken_readmes = set()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        # Connections checked out of the database pool while GitHub is
+        # being talked to
+        self.checked_out.append(async_engine.pool.checkedout())
+        path = request.url.path
+        if path.startswith("/users/") and path.endswith("/repos"):
+            page = int(request.url.params.get("page", 1))
+            per_page = int(request.url.params.get("per_page", 30))
+            return httpx.Response(200, json=self.repos[(page - 1) * per_page:page * per_page])
+        name = path.split("/")[3]
+        if path.endswith("/languages"):
+            return httpx.Response(200, json={"Python": 100})
+        if name in self.broken_readmes:
+            return httpx.Response(502, json={"message": "Server Error"})
+        if name == "no-readme":
+            return httpx.Response(404, json={"message": "Not Found"})
+        readme = f"# {name}".encode()
+        return httpx.Response(200, json={"content": base64.b64encode(readme).decode()})
+
+
+@pytest.fixture(autouse=True)
+def no_response_cache(monkeypatch):
+    monkeypatch.setattr(github_cache, "enabled", False)
+
+
+async def run_sync(db, user, full=False):
+    job = SyncJob(user_id=user.id, full=full, status="running", errors=[])
+    db.add(job)
+    await db.commit()
+    await sync_job_queue._run(job.id)
+    await db.refresh(job)
+    return job
+
+
+async def test_sync_job_holds_no_connection_during_github_requests(db, make_user, mock_github):
+    api = FakeRestAPI([rest_repo(i, f"repo-{i}") for i in range(20)])
+    mock_github(api)
+    user = await make_user("alice")
+
+    job = await run_sync(db, user)
+
+    assert job.status == "completed", job.errors
+    assert job.repos_done == job.repos_total == 20
+    assert len(api.checked_out) == 41
+    assert set(api.checked_out) == {0}
+    names = (await db.scalars(select(Project.name).order_by(Project.github_id))).all()
+    assert names == [f"repo-{i}" for i in range(20)]
+
+
+async def stored_updated_at(db):
+    rows = await db.execute(select(Project.name, Project.github_updated_at))
+    return dict(rows.all())
+
+
+async def test_failed_enrichment_is_retried_by_the_next_sync(db, make_user, mock_github):
+    api = FakeRestAPI([rest_repo(1, "steady"), rest_repo(2, "flaky")])
+    mock_github(api)
+    user = await make_user("alice")
+    await run_sync(db, user)
+    first = await stored_updated_at(db)
+
+    # Both repos change on GitHub, but flaky's README can't be fetched
+    api.repos = [rest_repo(1, "steady", "2024-06-01T10:00:00Z"),
+                 rest_repo(2, "flaky", "2024-06-01T10:00:00Z")]
+    api.broken_readmes = {"flaky"}
+    job = await run_sync(db, user)
+    assert job.status == "completed", job.errors
+    second = await stored_updated_at(db)
+    assert second["steady"] > first["steady"]
+    assert second["flaky"] == first["flaky"]
+
+    # Once it can be fetched again, the next incremental sync picks it up
+    api.broken_readmes = set()
+    api.checked_out = []
+    await run_sync(db, user)
+    assert len(api.checked_out) == 1 + 2  # repo list + flaky's enrichment
+    third = await stored_updated_at(db)
+    assert third["flaky"] == third["steady"]
+
+
+async def test_new_repo_is_not_stored_until_it_can_be_enriched(db, make_user, mock_github):
+    api = FakeRestAPI([rest_repo(1, "flaky"), rest_repo(2, "no-readme")])
+    api.broken_readmes = {"flaky"}
+    mock_github(api)
+    user = await make_user("alice")
+
+    await run_sync(db, user)
+
+    # A missing README is fine; a failed request is not
+    assert list(await stored_updated_at(db)) == ["no-readme"]
+
+
+async def test_sync_writes_all_projects_in_one_statement_and_transaction(db, make_user, mock_github, queries):
+    commits = []
+
+    def record_commit(connection):
+        commits.append(connection)
+
+    event.listen(async_engine.sync_engine, "commit", record_commit)
+    try:
+        shapes = {}
+        for count in (1, 100):
+            mock_github(FakeRestAPI([rest_repo(i, f"repo-{i}") for i in range(count)]))
+            user = await make_user(f"user{count}")
+            queries.clear()
+            commits.clear()
+
+            assert await sync_user_projects(user, db) == count
+
+            writes = [s.split()[0:3] for s, _ in queries if not s.lstrip().upper().startswith("SELECT")]
+            shapes[count] = (writes, len(commits))
+    finally:
+        event.remove(async_engine.sync_engine, "commit", record_commit)
+
+    # Same statements and commits whatever the number of repos: one
+    # projects upsert, the users update, the read commit and the final one
+    assert shapes[1] == shapes[100]
+    writes, commit_count = shapes[100]
+    assert sum(w[:3] == ["INSERT", "INTO", "projects"] for w in writes) == 1
+    assert commit_count == 2
+    assert await db.scalar(select(func.count()).select_from(Project)) == 101
+
+
+async def test_resync_updates_rows_and_keeps_user_choices(db, make_user, mock_github):
+    api = FakeRestAPI([rest_repo(1, "repo")])
+    mock_github(api)
+    user = await make_user("alice")
+    await sync_user_projects(user, db)
+    project = await db.scalar(select(Project))
+    created_at = project.created_at
+    await db.execute(update(Project).values(is_visible=False))
+    await db.commit()
+
+    changed = rest_repo(1, "renamed", "2024-07-01T10:00:00Z")
+    changed["stargazers_count"] = 42
+    api.repos = [changed]
+    assert await sync_user_projects(user, db) == 1
+
+    db.expire_all()
+    project = await db.scalar(select(Project))
+    assert (project.name, project.stars) == ("renamed", 42)
+    assert project.is_visible is False
+    assert project.created_at == created_at
+    assert await db.scalar(select(func.count()).select_from(Project)) == 1
@@ -0,0 +1,72 @@
+import re
+
+import pytest
+from sqlalchemy import select
+
+from app.core.security import create_access_token
+from app.db.database import IS_SQLITE, engine
+from app.models import Project
+
+pytestmark = [
+    pytest.mark.anyio,
+    pytest.mark.skipif(not IS_SQLITE, reason="reads SQLite's EXPLAIN QUERY PLAN output"),
+]
+
+
+def query_plan(statement: str, parameters=()) -> str:
+    with engine.connect() as connection:
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+def assert_uses_index(plan: str, table: str, index: str):
+    searches = re.findall(rf"SEARCH {table} USING (?:COVERING )?INDEX (\w+)", plan)
+    assert index in searches, f"{table} is not searched with {index}:\n{plan}"
+
+
+def recorded(queries, pattern: str):
+    """The one recorded statement matching a regex"""
+    matches = [(s, p) for s, p in queries if re.search(pattern, s, re.S)]
+    assert len(matches) == 1, [s for s, _ in matches]
+    return matches[0]
+
+
+async def test_public_portfolio_queries_use_their_indexes(client, make_user, queries):
+    await make_user("alice", projects=3, details=True)
+    await make_user("bob", projects=3, details=True)
+
+    assert (await client.get("/portfolio/alice")).status_code == 200
+
+    expected = {
+        r"FROM projects\s.*is_visible": ("projects", "ix_projects_user_visible"),
+        r"FROM media\s.*media\.project_id IN": ("media", "ix_media_project_id"),
+        r"FROM media\s.*media\.project_id IS NULL": ("media", "ix_media_user_project"),
+        r"FROM experiences\s": ("experiences", "ix_experiences_user_id"),
+        r"FROM education\s": ("education", "ix_education_user_id"),
+        r"FROM skills\s": ("skills", "ix_skills_user_id"),
+    }
+    for pattern, (table, index) in expected.items():
+        assert_uses_index(query_plan(*recorded(queries, pattern)), table, index)
+
+
+async def test_status_filtered_project_count_uses_user_status_index(client, make_user, queries):
+    user = await make_user("alice", projects=3)
+    token = create_access_token({"sub": str(user.id)})
+
+    response = await client.get(
+        "/projects",
+        params={"status_filter": "deployed"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+
+    count = recorded(queries, r"count\(\*\).*projects\.status")
+    assert_uses_index(query_plan(*count), "projects", "ix_projects_user_status")
+
+
+def test_repo_lookup_uses_unique_user_repo_index(schema):
+    statement = select(Project.id).filter(Project.user_id == 1, Project.github_id == 7)
+    compiled = statement.compile(engine)
+    parameters = tuple(compiled.params[name] for name in compiled.positiontup)
+
+    assert_uses_index(query_plan(str(compiled), parameters), "projects", "uq_projects_user_github")
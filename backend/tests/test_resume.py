@@ -0,0 +1,138 @@
+import io
+
+import docx
+import pytest
+
+from app.core.security import create_access_token
+from app.services.resume_parser import ResumeParser
+from app.services.resume_cache import resume_cache
+from app.services.resume_pool import resume_pool
+
+pytestmark = pytest.mark.anyio
+
+DOCX_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+PDF_TYPE = "application/pdf"
+
+
+def make_docx(*paragraphs: str) -> bytes:
+    document = docx.Document()
+    for paragraph in paragraphs:
+        document.add_paragraph(paragraph)
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+def make_pdf(pages):
+    """A PDF with one page per list of text lines"""
+    objects = [b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>", None]
+    kids = []
+    for lines in pages:
+        text = b" ".join(b"(" + line.encode() + b") Tj T*" for line in lines)
+        stream = b"BT /F1 10 Tf 40 800 Td 12 TL " + text + b" ET"
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            b"/Resources << /Font << /F1 1 0 R >> >> /Contents %d 0 R >>" % len(objects)
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids), len(kids)
+    )
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, len(objects), xref
+    )
+    return bytes(out)
+
+
+RESUME = make_docx(
+    "Alice Example",
+    "Senior Software Engineer at Example Corp",
+    "Skills: Python, Docker, PostgreSQL",
+    "Bachelor of Science, University of Somewhere",
+)
+
+
+@pytest.fixture(autouse=True)
+def worker_pool():
+    yield
+    resume_pool.stop()
+
+
+@pytest.fixture
+async def auth_headers(make_user):
+    user = await make_user("alice")
+    return {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+
+
+async def upload(client, headers, content: bytes, filename: str = "resume.docx"):
+    return await client.post(
+        "/resume/upload",
+        headers=headers,
+        files={"file": (filename, content, DOCX_TYPE)},
+    )
+
+
+async def test_upload_parses_and_stores_text(client, auth_headers):
+    response = await upload(client, auth_headers, RESUME)
+
+    assert response.status_code == 200
+    skills = {skill["name"] for skill in response.json()["parsed_data"]["skills"]}
+    assert {"python", "docker", "postgresql"} <= skills
+
+    stored = await client.get("/resume/text", headers=auth_headers)
+    assert "Example Corp" in stored.json()["resume_text"]
+
+
+async def test_pdf_upload_is_parsed(client, auth_headers):
+    pdf = make_pdf([["Alice Example", "Skills: Python, Docker"], ["Kubernetes and AWS"]])
+    response = await client.post(
+        "/resume/upload",
+        headers=auth_headers,
+        files={"file": ("resume.pdf", pdf, PDF_TYPE)},
+    )
+
+    assert response.status_code == 200
+    skills = {skill["name"] for skill in response.json()["parsed_data"]["skills"]}
+    assert {"python", "docker", "kubernetes", "aws"} <= skills
+
+
+def test_pdf_pages_are_extracted_in_ranges_under_a_budget(tmp_path):
+    path = tmp_path / "resume.pdf"
+    path.write_bytes(make_pdf([[f"Page {i} text"] for i in range(6)]))
+
+    text, page_count = ResumeParser.extract_pdf_pages(str(path), 2, 4)
+    assert page_count == 6
+    assert "Page 2" in text and "Page 3" in text and "Page 4" not in text
+
+    text, _ = ResumeParser.extract_pdf_pages(str(path), max_chars=8)
+    assert text == "Page 0 t"
+
+
+async def test_repeat_upload_is_served_from_cache(client, auth_headers):
+    first = await upload(client, auth_headers, RESUME)
+    hits = resume_cache.hits
+    completed = resume_pool.stats["completed"]
+
+    second = await upload(client, auth_headers, RESUME, filename="copy.docx")
+
+    assert second.status_code == 200
+    assert second.json()["parsed_data"]["skills"] == first.json()["parsed_data"]["skills"]
+    assert second.json()["parsed_data"]["raw_text"] == first.json()["parsed_data"]["raw_text"]
+    assert resume_cache.hits == hits + 1
+    assert resume_pool.stats["completed"] == completed
+
+
+async def test_unsupported_content_is_rejected(client, auth_headers):
+    response = await upload(client, auth_headers, b"just some text", filename="resume.docx")
+    assert response.status_code == 400
@@ -0,0 +1,111 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.services.resume_pool import (
+    ResumeProcessPool, ResumeProcessingError, _WorkerDied, resume_pool,
+)
+from test_resume import DOCX_TYPE, RESUME
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(settings, "RESUME_WORKERS", 2)
+    pool = ResumeProcessPool()
+    pool.start()
+    yield pool
+    pool.stop()
+
+
+def worker_pids(pool):
+    return {worker.process.pid for worker in pool._idle}
+
+
+async def test_timeout_only_replaces_the_stuck_worker(pool):
+    loop = asyncio.get_running_loop()
+    before = worker_pids(pool)
+
+    stuck = asyncio.ensure_future(pool._call(loop.time() + 0.5, time.sleep, 30))
+    other = asyncio.ensure_future(pool._call(loop.time() + 10, time.sleep, 1.5))
+
+    with pytest.raises(asyncio.TimeoutError):
+        await stuck
+    # The other call keeps running on its worker and finishes normally
+    assert await other is None
+
+    after = worker_pids(pool)
+    assert len(before & after) == 1
+    assert pool.stats["workers_replaced"] == 1
+
+    # The pool is back to full strength
+    calls = [pool._call(loop.time() + 10, sum, [1, 2]) for _ in range(4)]
+    assert await asyncio.gather(*calls) == [3] * 4
+
+
+async def test_crashed_worker_only_fails_its_own_call(pool):
+    loop = asyncio.get_running_loop()
+
+    crashed = asyncio.ensure_future(pool._call(loop.time() + 10, os._exit, 1))
+    other = asyncio.ensure_future(pool._call(loop.time() + 10, time.sleep, 1))
+
+    with pytest.raises(_WorkerDied):
+        await crashed
+    assert await other is None
+    assert pool.stats["workers_replaced"] == 1
+
+
+async def test_errors_raised_by_the_call_keep_the_worker(pool):
+    loop = asyncio.get_running_loop()
+    before = worker_pids(pool)
+
+    with pytest.raises(FileNotFoundError):
+        await pool._call(loop.time() + 10, open, "/nonexistent/resume.pdf")
+
+    assert worker_pids(pool) == before
+
+
+async def test_submit_reports_timeouts(pool, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "RESUME_JOB_TIMEOUT", 0)
+    path = tmp_path / "resume.docx"
+    path.write_bytes(RESUME)
+
+    with pytest.raises(ResumeProcessingError, match="timed out"):
+        await pool.submit(str(path), DOCX_TYPE)
+    assert pool.stats["timeouts"] == 1
+
+
+async def test_uploads_do_not_stall_portfolio_reads(client, make_user, request):
+    """Load test: concurrent uploads while the public portfolio is being read"""
+    request.addfinalizer(resume_pool.stop)
+    user = await make_user("alice", projects=20, details=True)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+    # A distinct file per upload so none are served from the resume cache
+    uploads = [
+        client.post(
+            "/resume/upload",
+            headers=headers,
+            files={"file": ("resume.docx", RESUME + bytes([i]), DOCX_TYPE)},
+        )
+        for i in range(settings.RESUME_MAX_PENDING)
+    ]
+
+    read_times = []
+
+    async def read():
+        started = time.monotonic()
+        response = await client.get("/portfolio/alice")
+        read_times.append(time.monotonic() - started)
+        return response
+
+    results = await asyncio.gather(*uploads, *(read() for _ in range(40)))
+
+    upload_codes = [r.status_code for r in results[:len(uploads)]]
+    assert upload_codes == [200] * len(uploads)
+    assert all(r.status_code == 200 for r in results[len(uploads):])
+    assert max(read_times) < 2.0
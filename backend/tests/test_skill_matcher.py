@@ -0,0 +1,72 @@
+import json
+import random
+
+import pytest
+
+from app.services.skill_matcher import KeywordMatcher, SkillMatcher, load_skill_taxonomy
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return SkillMatcher(load_skill_taxonomy())
+
+
+def names(matcher, text: str):
+    return [skill["name"] for skill in matcher.find_skills(text)]
+
+
+@pytest.mark.parametrize("text", [
+    "The project is gone for good",
+    "Hosted on github and gitlab",
+    "Frontend in javascript only",
+    "Certified in javanese cooking",
+])
+def test_terms_inside_longer_words_do_not_match(matcher, text):
+    assert not {"go", "git", "java"} & set(names(matcher, text))
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Wrote services in C# and C++.", ["c#", "c++"]),
+    ("Owned the CI/CD pipeline", ["ci/cd"]),
+    ("Set up continuous integration", ["ci/cd"]),
+    ("Used csharp, cpp and golang", ["c#", "c++", "go"]),
+    ("Go, Git and Java (not JavaScript)", ["git", "go", "java", "javascript"]),
+    ("Node (js) and ecmascript", ["javascript"]),
+])
+def test_punctuated_terms_and_aliases_match(matcher, text, expected):
+    assert names(matcher, text) == expected
+
+
+def test_categories_come_from_the_taxonomy(matcher):
+    assert matcher.find_skills("git") == [{"name": "git", "category": "tool"}]
+
+
+def test_custom_taxonomy_file(tmp_path):
+    path = tmp_path / "skills.json"
+    path.write_text(json.dumps([{"name": "Rust", "aliases": ["rustlang"]}]))
+
+    matcher = SkillMatcher(load_skill_taxonomy(str(path)))
+
+    assert names(matcher, "rustlang and rust-analyzer") == ["Rust"]
+    assert matcher.find_skills("rust") == [{"name": "Rust", "category": None}]
+
+
+def test_invalid_taxonomy_is_rejected(tmp_path):
+    path = tmp_path / "skills.json"
+    path.write_text(json.dumps([{"aliases": ["nameless"]}]))
+
+    with pytest.raises(ValueError, match="Invalid skill taxonomy"):
+        load_skill_taxonomy(str(path))
+
+
+def test_thousands_of_terms_match_whole_tokens_in_order():
+    rng = random.Random(7)
+    alphabet = "abcdego+#./-"
+    terms = sorted({"".join(rng.choices(alphabet, k=rng.randint(1, 6))) for _ in range(5000)})
+    placed = rng.sample(terms, 300)
+
+    matcher = KeywordMatcher.from_terms(terms)
+
+    # Each placed term is found whole, never a shorter term inside it
+    assert matcher.find_all(" ".join(placed)) == list(dict.fromkeys(placed))
+    assert not matcher.search("zzz " * 100)
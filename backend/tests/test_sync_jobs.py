@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select
+
+from app.db.database import AsyncSessionLocal
+from app.models import SyncJob
+from app.services.sync_jobs import SyncJobQueue
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_concurrent_enqueues_share_one_active_job(db, make_user):
+    user = await make_user("alice")
+    queue = SyncJobQueue()
+    # Both requests look for an active job before either inserts one
+    both_looked = asyncio.Barrier(2)
+
+    async def enqueue():
+        async with AsyncSessionLocal() as session:
+            lookup = session.scalar
+
+            async def scalar_then_wait(statement):
+                session.scalar = lookup
+                result = await lookup(statement)
+                await both_looked.wait()
+                return result
+
+            session.scalar = scalar_then_wait
+            return (await queue.enqueue(session, user.id)).id
+
+    job_ids = await asyncio.gather(enqueue(), enqueue())
+
+    assert job_ids[0] == job_ids[1]
+    assert (await db.scalars(select(SyncJob.id))).all() == [job_ids[0]]
+
+
+async def test_worker_survives_a_crashing_job(db, make_user, monkeypatch):
+    alice = await make_user("alice")
+    bob = await make_user("bob")
+    queue = SyncJobQueue()
+    ran = []
+
+    async def run(job_id):
+        ran.append(job_id)
+        if len(ran) == 1:
+            raise RuntimeError("commit failed")
+        async with AsyncSessionLocal() as session:
+            job = await session.get(SyncJob, job_id)
+            job.status = "completed"
+            await session.commit()
+
+    monkeypatch.setattr(queue, "_run", run)
+    monkeypatch.setattr("app.services.sync_jobs.settings.SYNC_WORKERS", 1)
+    first = await queue.enqueue(db, alice.id)
+    second = await queue.enqueue(db, bob.id)
+
+    await queue.start()
+    try:
+        for _ in range(100):
+            if len(ran) == 2:
+                break
+            await asyncio.sleep(0.05)
+    finally:
+        await queue.stop()
+
+    assert ran == [first.id, second.id]
+    await db.refresh(first)
+    await db.refresh(second)
+    assert first.status == "failed"
+    assert first.errors == ["commit failed"]
+    assert first.finished_at is not None
+    assert second.status == "completed"
+
+
+async def test_deleted_job_is_skipped(db):
+    queue = SyncJobQueue()
+
+    # Returns instead of raising on the missing row
+    await queue._run(12345)
@@ -0,0 +1,154 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select
+
+from app.api import auth
+from app.core.security import create_access_token
+from app.core.token_cache import Principal, TokenCache, token_cache
+from app.models import User
+from app.services.github_service import github_service
+
+pytestmark = pytest.mark.anyio
+
+
+def principal(user_id: int = 1, **fields) -> Principal:
+    return Principal(**{
+        "id": user_id,
+        "github_username": f"user{user_id}",
+        "portfolio_username": f"user{user_id}",
+        "is_public": True,
+        "has_github_token": True,
+        **fields,
+    })
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controls the token cache's monotonic and wall clocks"""
+    now = SimpleNamespace(value=1000.0)
+    fake_time = SimpleNamespace(
+        monotonic=lambda: now.value,
+        time=lambda: 1_700_000_000 + now.value,
+    )
+    monkeypatch.setattr("app.core.token_cache.time", fake_time)
+    return now
+
+
+def test_entries_expire_after_the_ttl(clock):
+    cache = TokenCache()
+    cache.ttl = 60
+    cache.put("token", principal())
+
+    clock.value += 59
+    assert cache.get("token") == principal()
+    clock.value += 2
+    assert cache.get("token") is None
+    assert cache.get_stats()["entries"] == 0
+
+
+def test_ttl_never_outlives_the_token(clock):
+    cache = TokenCache()
+    cache.ttl = 60
+    token_exp = 1_700_000_000 + clock.value + 10
+    cache.put("token", principal(), token_exp)
+
+    clock.value += 11
+    assert cache.get("token") is None
+
+    # An already expired token isn't cached at all
+    cache.put("expired", principal(), token_exp - 20)
+    assert cache.get_stats()["entries"] == 0
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = TokenCache()
+    cache.max_entries = 2
+    cache.put("a", principal(1))
+    cache.put("b", principal(2))
+    assert cache.get("a") is not None
+
+    cache.put("c", principal(3))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache._tokens_by_user == {1: {"a"}, 3: {"c"}}
+
+
+def test_invalidate_user_drops_all_of_their_tokens(clock):
+    cache = TokenCache()
+    cache.put("phone", principal(1))
+    cache.put("laptop", principal(1))
+    cache.put("other", principal(2))
+
+    cache.invalidate_user(1)
+
+    assert cache.get("phone") is None and cache.get("laptop") is None
+    assert cache.get("other") is not None
+
+
+@pytest.fixture
+async def user_token(make_user):
+    user = await make_user("alice")
+    return user, create_access_token({"sub": str(user.id)})
+
+
+async def test_principal_is_served_from_the_cache(client, user_token, queries):
+    user, token = user_token
+    headers = {"Authorization": f"Bearer {token}"}
+    assert (await client.get("/projects", headers=headers)).status_code == 200
+    queries.clear()
+
+    assert (await client.get("/projects", headers=headers)).status_code == 200
+
+    assert not [s for s, _ in queries if "FROM users" in s]
+    assert token_cache.get(token).id == user.id
+
+
+async def test_profile_update_invalidates_the_cached_principal(client, user_token):
+    user, token = user_token
+    headers = {"Authorization": f"Bearer {token}"}
+    assert (await client.get("/projects", headers=headers)).status_code == 200
+    assert token_cache.get(token).is_public is True
+
+    response = await client.put("/users/me", headers=headers, json={"is_public": False})
+    assert response.status_code == 200
+
+    assert token_cache.get(token) is None
+    assert (await client.get("/projects", headers=headers)).status_code == 200
+    assert token_cache.get(token).is_public is False
+
+
+async def test_oauth_login_invalidates_the_cached_principal(client, db, make_user, monkeypatch):
+    user = await make_user("alice", github_id=42, access_token=None)
+    token = create_access_token({"sub": str(user.id)})
+    headers = {"Authorization": f"Bearer {token}"}
+    assert (await client.get("/projects", headers=headers)).status_code == 200
+    assert token_cache.get(token).has_github_token is False
+
+    async def exchange_code_for_token(code):
+        return {"access_token": "gho_new"}
+
+    async def get_user_profile(access_token):
+        return {"id": 42, "login": "alice"}
+
+    monkeypatch.setattr(github_service, "exchange_code_for_token", exchange_code_for_token)
+    monkeypatch.setattr(github_service, "get_user_profile", get_user_profile)
+    monkeypatch.setitem(auth.oauth_states, "state", True)
+    response = await client.get("/auth/callback", params={"code": "code", "state": "state"})
+    assert response.status_code == 307
+
+    assert token_cache.get(token) is None
+    assert await db.scalar(select(User.access_token).filter(User.id == user.id)) == "gho_new"
+    assert (await client.get("/projects", headers=headers)).status_code == 200
+    assert token_cache.get(token).has_github_token is True
+
+
+async def test_logout_drops_the_token(client, user_token):
+    _, token = user_token
+    headers = {"Authorization": f"Bearer {token}"}
+    assert (await client.get("/projects", headers=headers)).status_code == 200
+
+    assert (await client.post("/auth/logout", headers=headers)).status_code == 200
+
+    assert token_cache.get(token) is None